@@ -1,13 +1,40 @@
-from .client import SongstatsClient
-from .models import (
-    TrackInfo, TrackStats, HistoricStats,
-    ArtistInfo, Activity, Playlist, Chart
-)
-from .exceptions import APIError, RateLimitException
+import importlib
+
+# Names are imported from their submodule on first access (PEP 562), so
+# `import songstats` stays cheap and `requests` is only loaded once a
+# client actually sends a request.
+_EXPORTS = {
+    'SongstatsClient': 'client',
+    'TrackInfo': 'models',
+    'TrackStats': 'models',
+    'HistoricStats': 'models',
+    'ArtistInfo': 'models',
+    'Activity': 'models',
+    'Playlist': 'models',
+    'Chart': 'models',
+    'APIError': 'exceptions',
+    'RateLimitException': 'exceptions',
+    'IdentityMap': 'identity',
+    'ActivityFeed': 'feed',
+}
 
 __all__ = [
     'SongstatsClient',
     'TrackInfo', 'TrackStats', 'HistoricStats',
     'ArtistInfo', 'Activity', 'Playlist', 'Chart',
-    'APIError', 'RateLimitException'
+    'APIError', 'RateLimitException',
+    'IdentityMap', 'ActivityFeed'
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,269 @@
+"""
+Catalog-level rollups over historic stats.
+
+A :class:`HistoryFrame` aligns the histories of many tracks on a shared
+daily date axis, one ``(tracks, dates)`` array per source and metric, so
+label- or collaborator-level totals, deltas, growth rates and rolling
+windows are NumPy array operations instead of Python loops. Frames are
+built from ``historic_stats`` results or a :class:`~songstats.store.HistoricStore`.
+
+Requires NumPy (``pip install python-songstats[numpy]``).
+"""
+import dataclasses
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError("songstats.aggregate requires numpy: pip install python-songstats[numpy]") from e
+
+from .models import HistoricStats
+
+METRICS: Tuple[str, ...] = tuple(
+    f.name for f in dataclasses.fields(HistoricStats) if f.name != 'date'
+)
+
+Histories = Mapping[str, Sequence[HistoricStats]]
+
+
+def forward_fill(values: 'np.ndarray') -> 'np.ndarray':
+    """Carry the last known value forward along the last axis; leading gaps stay NaN."""
+    values = np.asarray(values, dtype=float)
+    index = np.where(np.isnan(values), 0, np.arange(values.shape[-1]))
+    np.maximum.accumulate(index, axis=-1, out=index)
+    return np.take_along_axis(values, index, axis=-1)
+
+
+def delta(values: 'np.ndarray') -> 'np.ndarray':
+    """Day-over-day change along the last axis; the first day is NaN."""
+    values = np.asarray(values, dtype=float)
+    out = np.full_like(values, np.nan)
+    out[..., 1:] = values[..., 1:] - values[..., :-1]
+    return out
+
+
+def growth(values: 'np.ndarray') -> 'np.ndarray':
+    """Day-over-day relative change along the last axis; NaN where undefined."""
+    values = np.asarray(values, dtype=float)
+    out = np.full_like(values, np.nan)
+    previous = values[..., :-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[..., 1:] = np.where(previous != 0, (values[..., 1:] - previous) / previous, np.nan)
+    return out
+
+
+def rolling(values: 'np.ndarray', window: int, how: str = 'sum') -> 'np.ndarray':
+    """
+    Trailing rolling ``sum`` or ``mean`` over ``window`` days along the last axis.
+
+    Missing values count as zero for ``sum`` and are skipped for ``mean``.
+    The first ``window - 1`` days are NaN.
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    if how not in ('sum', 'mean'):
+        raise ValueError(f"Unknown rolling aggregation: {how}")
+    values = np.asarray(values, dtype=float)
+    present = ~np.isnan(values)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    sums = np.pad(np.cumsum(np.where(present, values, 0.0), axis=-1), pad)
+    window_sums = sums[..., window:] - sums[..., :-window]
+    if how == 'mean':
+        counts = np.pad(np.cumsum(present, axis=-1), pad)
+        window_counts = counts[..., window:] - counts[..., :-window]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            window_sums = np.where(window_counts > 0, window_sums / window_counts, np.nan)
+    out = np.full_like(values, np.nan)
+    out[..., window - 1:] = window_sums
+    return out
+
+
+def _sum_rows(values: 'np.ndarray') -> 'np.ndarray':
+    """Sum over the first axis; NaN where every row is NaN."""
+    if not len(values):
+        return np.full(values.shape[1:], np.nan)
+    return np.where(np.isnan(values).all(axis=0), np.nan, np.nansum(values, axis=0))
+
+
+class HistoryFrame:
+    """
+    Historic stats of many tracks aligned on one date axis.
+
+    ``values[(source, metric)]`` is a float array of shape
+    ``(len(tracks), len(dates))`` with NaN for days without data.
+    """
+
+    def __init__(
+            self,
+            dates: 'np.ndarray',
+            tracks: List[str],
+            values: Dict[Tuple[str, str], 'np.ndarray'],
+    ):
+        self.dates = dates
+        self.tracks = tracks
+        self.values = values
+
+    @classmethod
+    def from_histories(
+            cls,
+            histories: Mapping[str, Histories],
+            sources: Optional[Iterable[str]] = None,
+            metrics: Optional[Iterable[str]] = None,
+            fill: bool = True,
+    ) -> 'HistoryFrame':
+        """
+        Build a frame from ``{isrc: client.track.historic_stats(isrc)}``.
+
+        Parameters:
+            histories: Historic stats per track, keyed by ISRC
+            sources (optional): Only include these sources
+            metrics (optional): Only include these metrics (default: all HistoricStats metrics)
+            fill (bool): Forward-fill gaps per track, so cumulative totals do not dip
+                on days a track has no data point (default: True)
+        """
+        metrics = tuple(metrics) if metrics is not None else METRICS
+        wanted = set(sources) if sources is not None else None
+        tracks = list(histories)
+
+        # Parse every history's dates once and find the shared axis.
+        parsed = []
+        first, last = None, None
+        for row, isrc in enumerate(tracks):
+            for source, entries in histories[isrc].items():
+                if (wanted is not None and source not in wanted) or not entries:
+                    continue
+                dates = np.array([e.date for e in entries], dtype='datetime64[D]')
+                parsed.append((row, source, entries, dates))
+                first = dates.min() if first is None else min(first, dates.min())
+                last = dates.max() if last is None else max(last, dates.max())
+
+        if first is None:
+            return cls(np.array([], dtype='datetime64[D]'), tracks, {})
+
+        axis = np.arange(first, last + 1, dtype='datetime64[D]')
+        values: Dict[Tuple[str, str], np.ndarray] = {}
+        for row, source, entries, dates in parsed:
+            columns = (dates - first).astype(int)
+            for metric in metrics:
+                raw = [getattr(e, metric) for e in entries]
+                if all(v is None for v in raw):
+                    continue
+                key = (source, metric)
+                if key not in values:
+                    values[key] = np.full((len(tracks), len(axis)), np.nan)
+                values[key][row, columns] = np.array(raw, dtype=float)
+
+        if fill:
+            values = {key: forward_fill(array) for key, array in values.items()}
+        return cls(axis, tracks, values)
+
+    @classmethod
+    def from_store(
+            cls,
+            store,
+            isrcs: Optional[Sequence[str]] = None,
+            sources: Optional[Iterable[str]] = None,
+            metrics: Optional[Iterable[str]] = None,
+            fill: bool = True,
+    ) -> 'HistoryFrame':
+        """
+        Build a frame from a :class:`~songstats.store.HistoricStore`.
+
+        Without ``isrcs`` and ``fill`` the values are zero-copy views of the
+        store's memory-mapped columns.
+        """
+        wanted_sources = set(sources) if sources is not None else None
+        wanted_metrics = set(metrics) if metrics is not None else None
+        rows = None if isrcs is None else np.array([store.row(isrc) for isrc in isrcs], dtype=np.int64)
+        values: Dict[Tuple[str, str], np.ndarray] = {}
+        for source, metric in store.columns():
+            if wanted_sources is not None and source not in wanted_sources:
+                continue
+            if wanted_metrics is not None and metric not in wanted_metrics:
+                continue
+            array = store.column(source, metric).T
+            if rows is not None:
+                array = array[rows]
+            values[(source, metric)] = forward_fill(array) if fill else array
+        tracks = list(isrcs) if isrcs is not None else list(store.isrcs)
+        return cls(store.dates, tracks, values)
+
+    @property
+    def sources(self) -> List[str]:
+        return sorted({source for source, _ in self.values})
+
+    @property
+    def metrics(self) -> List[str]:
+        return sorted({metric for _, metric in self.values})
+
+    def series(self, metric: str, source: Optional[str] = None) -> 'np.ndarray':
+        """
+        Per-track values of ``metric``, shape ``(tracks, dates)``.
+
+        With ``source=None`` the metric is summed over all sources.
+        """
+        if source is not None:
+            if (source, metric) in self.values:
+                return self.values[(source, metric)]
+            return np.full((len(self.tracks), len(self.dates)), np.nan)
+        arrays = [array for (_, m), array in self.values.items() if m == metric]
+        if not arrays:
+            return np.full((len(self.tracks), len(self.dates)), np.nan)
+        return _sum_rows(np.stack(arrays))
+
+    def total(self, metric: str, source: Optional[str] = None) -> 'np.ndarray':
+        """Catalog-wide total of ``metric`` per date; NaN where no track has data."""
+        return _sum_rows(self.series(metric, source))
+
+    def delta(self, metric: str, source: Optional[str] = None) -> 'np.ndarray':
+        """
+        Daily change of ``metric`` summed over the catalog.
+
+        Changes are taken per track and source before summing, so a track
+        contributes nothing on the day its history starts instead of its
+        whole lifetime total.
+        """
+        changes, _ = self._changes(metric, source)
+        return _sum_rows(changes)
+
+    def growth(self, metric: str, source: Optional[str] = None) -> 'np.ndarray':
+        """Daily change relative to the previous day, over the tracks present on both days."""
+        changes, previous = self._changes(metric, source)
+        present = ~np.isnan(changes)
+        gained = np.where(present, changes, 0.0).sum(axis=0)
+        base = np.where(present, previous, 0.0).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(present.any(axis=0) & (base != 0), gained / base, np.nan)
+
+    def rolling(self, metric: str, window: int, source: Optional[str] = None,
+                how: str = 'sum', daily: bool = True) -> 'np.ndarray':
+        """
+        Rolling window over the catalog-wide total.
+
+        With ``daily=True`` the window runs over the summed daily changes from
+        :meth:`delta` (e.g. streams gained in the last 7 days), otherwise over
+        the totals themselves.
+        """
+        values = self.delta(metric, source) if daily else self.total(metric, source)
+        return rolling(values, window, how)
+
+    def _changes(self, metric: str, source: Optional[str]) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Day-over-day changes and previous values, one row per track and source."""
+        arrays = [array for (s, m), array in self.values.items()
+                  if m == metric and (source is None or s == source)]
+        if not arrays:
+            empty = np.full((0, len(self.dates)), np.nan)
+            return empty, empty
+        values = np.concatenate(arrays)
+        previous = np.full_like(values, np.nan)
+        previous[:, 1:] = values[:, :-1]
+        return delta(values), previous
+
+    def rollup(self, metrics: Optional[Iterable[str]] = None) -> Dict[Tuple[str, str], 'np.ndarray']:
+        """Catalog-wide totals for every ``(source, metric)`` in the frame."""
+        wanted = set(metrics) if metrics is not None else None
+        return {
+            (source, metric): self.total(metric, source)
+            for source, metric in self.values
+            if wanted is None or metric in wanted
+        }
@@ -0,0 +1,192 @@
+"""
+Bulk fetching with decoding offloaded to worker processes.
+
+In large batch runs, building thousands of ``Playlist``/``Chart`` objects
+per response keeps one core busy while fetch threads wait on the GIL.
+:class:`BulkFetcher` downloads responses on threads and hands the raw bytes
+to a process pool, which runs the JSON decoding. Workers build compact
+tuples straight from the payload (the rows of :func:`songstats.parsing.pack`,
+without constructing the models), which pickle several times faster than
+dataclass instances.
+
+By default the models are rebuilt from those tuples in the calling process.
+That rebuild constructs every ``Playlist``/``Chart`` on the caller's single
+core, so the default path does not scale with ``processes``: past the point
+where the pool keeps up, adding workers only adds idle processes. Pass
+``packed=True`` to get the tuples instead, so only JSON decoding and tuple
+building are left, and they run in the pool; rebuild what is needed
+with :func:`songstats.parsing.unpack`.
+
+Identity maps and name indexes of the client are not applied in bulk mode.
+"""
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .endpoints import check_track_stats_fields
+from .models import HistoricStats, TrackInfo, TrackStats
+from .parsing import parse_stats, parse_track_info, row_decoder, unpack
+
+_decode_historic_row = row_decoder(HistoricStats)
+
+
+def decode_stats_payload(
+        payload: bytes,
+        sources: Optional[Sequence[str]] = None,
+        fields: Optional[Sequence[str]] = None,
+) -> List[tuple]:
+    """Parse a raw ``tracks/stats`` response body into packed TrackStats."""
+    return parse_stats(json.loads(payload)['stats'], sources=sources, fields=fields, packed=True)
+
+
+def decode_track_info_payload(payload: bytes) -> tuple:
+    """Parse a raw ``tracks/info`` response body into a packed TrackInfo."""
+    return parse_track_info(json.loads(payload), packed=True)
+
+
+def decode_historic_payload(payload: bytes) -> Dict[str, List[tuple]]:
+    """Parse a raw ``tracks/historic_stats`` response body into packed HistoricStats."""
+    return {
+        source['source']: [_decode_historic_row(entry) for entry in source['data']['history']]
+        for source in json.loads(payload)['stats']
+    }
+
+
+def _unpack_stats(rows: List[tuple]) -> List[TrackStats]:
+    return [unpack(TrackStats, row) for row in rows]
+
+
+def _unpack_track_info(row: tuple) -> TrackInfo:
+    return unpack(TrackInfo, row)
+
+
+def _unpack_historic(rows: Dict[str, List[tuple]]) -> Dict[str, List[HistoricStats]]:
+    return {source: [HistoricStats(*row) for row in entries] for source, entries in rows.items()}
+
+
+class BulkFetcher:
+    """
+    Fetch many tracks concurrently and decode the responses in worker processes.
+
+    Parameters:
+        client (SongstatsClient): Client used to send the requests
+        processes (int, optional): Worker processes for decoding (default: CPU count)
+        threads (int, optional): Threads sending requests (default: 8)
+        executor (Executor, optional): Executor for decoding, instead of a new process pool
+
+    Use as a context manager, or call close() to shut the pools down.
+    """
+
+    def __init__(self, client, processes: Optional[int] = None, threads: int = 8,
+                 executor: Optional[Executor] = None):
+        self.client = client
+        self._fetchers = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='songstats-bulk')
+        self._owns_decoders = executor is None
+        self._decoders = executor if executor is not None else ProcessPoolExecutor(max_workers=processes)
+
+    def __enter__(self) -> 'BulkFetcher':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._fetchers.shutdown()
+        if self._owns_decoders:
+            self._decoders.shutdown()
+
+    def current_stats(
+            self,
+            isrcs: Iterable[str],
+            sources: Optional[Sequence[str]] = None,
+            fields: Optional[Sequence[str]] = None,
+            return_exceptions: bool = False,
+            packed: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Current stats per ISRC, like ``client.track.current_stats``.
+
+        With ``packed=True`` each ISRC maps to a list of ``pack(TrackStats)`` tuples.
+        """
+        check_track_stats_fields(fields)
+        params: Dict[str, Any] = {}
+        if sources:
+            params["source"] = ",".join(sources)
+        return self._run(
+            "/tracks/stats", isrcs, params,
+            lambda payload: (decode_stats_payload, payload, sources, fields),
+            None if packed else _unpack_stats,
+            return_exceptions,
+        )
+
+    def info(self, isrcs: Iterable[str], return_exceptions: bool = False, packed: bool = False) -> Dict[str, Any]:
+        """
+        Track info per ISRC, like ``client.track.info``.
+
+        With ``packed=True`` each ISRC maps to a ``pack(TrackInfo)`` tuple.
+        """
+        return self._run(
+            "/tracks/info", isrcs, {},
+            lambda payload: (decode_track_info_payload, payload),
+            None if packed else _unpack_track_info,
+            return_exceptions,
+        )
+
+    def historic_stats(self, isrcs: Iterable[str], return_exceptions: bool = False,
+                       packed: bool = False) -> Dict[str, Any]:
+        """
+        Historic stats per ISRC, like ``client.track.historic_stats``.
+
+        With ``packed=True`` each source maps to a list of ``pack(HistoricStats)`` tuples.
+        """
+        return self._run(
+            "/tracks/historic_stats", isrcs, {},
+            lambda payload: (decode_historic_payload, payload),
+            None if packed else _unpack_historic,
+            return_exceptions,
+        )
+
+    def _run(
+            self,
+            endpoint: str,
+            isrcs: Iterable[str],
+            params: Dict[str, Any],
+            task: Callable[[bytes], Tuple],
+            rebuild: Optional[Callable[[Any], Any]],
+            return_exceptions: bool,
+    ) -> Dict[str, Any]:
+        """
+        Fetch every ISRC on threads and decode each body in the pool as soon as it arrives.
+
+        Failed ISRCs raise, or with ``return_exceptions=True`` map to their exception.
+        Without ``rebuild`` the packed results are returned as they are.
+        """
+        track = self.client.track
+        fetches = {
+            self._fetchers.submit(lambda isrc: track._get(endpoint, {"isrc": isrc, **params}).content, isrc): isrc
+            for isrc in dict.fromkeys(isrcs)
+        }
+        decodes = {}
+        results: Dict[str, Any] = {}
+        try:
+            for future in as_completed(fetches):
+                isrc = fetches[future]
+                try:
+                    decodes[self._decoders.submit(*task(future.result()))] = isrc
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results[isrc] = e
+            for future in as_completed(decodes):
+                isrc = decodes[future]
+                try:
+                    result = future.result()
+                    results[isrc] = rebuild(result) if rebuild is not None else result
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results[isrc] = e
+        finally:
+            for future in list(fetches) + list(decodes):
+                future.cancel()
+        return results
@@ -1,583 +1,201 @@
-import time
-from typing import Dict, Any, List, Optional
-import requests
+from typing import TYPE_CHECKING, Dict, Any, Optional, Sequence, Union
 from .constants import BASE_URL_PROD, BASE_URL_TEST
-from .exceptions import error_map, APIError, RateLimitException, ParameterError
-from .models import (
-    TrackInfo, TrackStats, HistoricStats,
-    ArtistInfo, Activity, AudioFeature, Link,
-    Playlist, Chart, Video, ShortVideo, Label, Distributor, Collaborator
-)
 
+if TYPE_CHECKING:
+    from .endpoints import TrackEndpoints, ArtistEndpoints, StatusEndpoints, CollaboratorEndpoints
+    from .hedging import HedgePolicy
+    from .identity import IdentityMap
+    from .keypool import KeyPool
+    from .ratelimit import RateLimiter, SharedRateLimiter
+    from .search_index import NameIndex
 
-class TrackEndpoints:
-    def __init__(self, session, base_url):
-        self.session = session
-        self.base_url = base_url.rstrip('/')
+# Endpoint classes live in .endpoints, which pulls in requests and the model
+# decoders; it is only imported once an endpoint group is first used.
+_ENDPOINTS = ('TrackEndpoints', 'ArtistEndpoints', 'StatusEndpoints', 'CollaboratorEndpoints')
 
-    def info(self, isrc: str = None, spotify_id: str = None) -> TrackInfo:
-        if not isrc and not spotify_id:
-            raise ParameterError('At least one of isrc or spotify_id must be provided!')
-        if isrc:
-            response = self._get("/tracks/info", {"isrc": isrc})
-        else:
-            response = self._get("/tracks/info", {"spotify_track_id": spotify_id})
-        data = response.json()
-        return self._parse_track_info(data)
-
-    def current_stats(self, isrc: str) -> List[TrackStats]:
-        response = self._get("/tracks/stats", {"isrc": isrc})
-        data = response.json()
-        return self._parse_stats(data['stats'])
-
-    def historic_stats(self, isrc: str) -> Dict[str, List[HistoricStats]]:
-        response = self._get("/tracks/historic_stats", {"isrc": isrc})
-        data = response.json()
-        return {
-            source['source']: [HistoricStats(**entry) for entry in source['data']['history']]
-            for source in data['stats']
-        }
-
-    def latest_activities(self, isrc: str, editorial: bool = False) -> List[Activity]:
-        response = self._get("/tracks/activities", {
-            "isrc": isrc,
-            "editorial": str(editorial).lower()
-        })
-        data = response.json()
-        return [Activity(**activity) for activity in data['activities']]
-
-    def _parse_track_info(self, data: Dict[str, Any]) -> TrackInfo:
-        track_data = data['track_info']
-        audio_features = [AudioFeature.from_dict(f) for f in data.get('audio_analysis', [])]
-
-        artists = [
-            ArtistInfo(
-                name=artist['name'],
-                songstats_artist_id=artist['songstats_artist_id']
-            ) for artist in track_data.get('artists', [])
-        ]
-
-        labels = [
-            Label(
-                name=label['name'],
-                songstats_label_id=label['songstats_label_id']
-            ) for label in track_data.get('labels', [])
-        ]
-
-        distributors = [
-            Distributor(name=dist['name'])
-            for dist in track_data.get('distributors', [])
-        ]
-
-        genres = track_data.get('genres', [])
-
-        links = [
-            Link(
-                source=link['source'],
-                external_id=link['external_id'],
-                url=link['url'],
-                isrc=link.get('isrc')
-            ) for link in track_data.get('links', [])
-        ]
-
-        collaborators = [
-            Collaborator(
-                name=collab['name'],
-                roles=collab['roles'],
-                songstats_collaborator_id=collab['songstats_collaborator_id']
-            ) for collab in track_data.get('collaborators', [])
-        ]
-
-        return TrackInfo(
-            songstats_track_id=track_data['songstats_track_id'],
-            title=track_data['title'],
-            artists=artists,
-            release_date=track_data['release_date'],
-            avatar=track_data.get('avatar'),
-            site_url=track_data.get('site_url'),
-            labels=labels,
-            distributors=distributors,
-            genres=genres,
-            links=links,
-            collaborators=collaborators,
-            audio_features=audio_features
-        )
-
-    def _parse_stats(self, stats_data: List[Dict[str, Any]]) -> List[TrackStats]:
-        stats = []
-        for source_data in stats_data:
-            source = source_data['source']
-            data = source_data['data']
-
-            playlists = [
-                Playlist(
-                    name=pl['name'],
-                    external_url=pl['external_url'],
-                    artwork=pl['artwork'],
-                    owner_name=pl['owner_name'],
-                    top_position=pl['top_position'],
-                    top_position_date=pl['top_position_date'],
-                    added_at=pl['added_at'],
-                    removed_at=pl.get('removed_at'),
-                    current_position=pl.get('current_position'),
-                    followers_count=pl.get('followers_count'),
-                    spotifyid=pl.get('spotifyid'),
-                    spotify_userid=pl.get('spotify_userid'),
-                    applemusicid=pl.get('applemusicid'),
-                    curator_name=pl.get('curator_name'),
-                    curator_id=pl.get('curator_id'),
-                    playlist_country_code=pl.get('playlist_country_code'),
-                    playlist_type=pl.get('playlist_type'),
-                    amazonid=pl.get('amazonid'),
-                    rank=pl.get('rank'),
-                    region=pl.get('region'),
-                    deezerid=pl.get('deezerid'),
-                    deezer_userid=pl.get('deezer_userid'),
-                    chart_type=pl.get('chart_type')
-                ) for pl in data.get('playlists', [])
-            ]
-
-            charts = [
-                Chart(
-                    name=chart['name'],
-                    top_position=chart['top_position'],
-                    top_position_date=chart['top_position_date'],
-                    added_at=chart['added_at'],
-                    removed_at=chart.get('removed_at'),
-                    current_position=chart.get('current_position'),
-                    location_type=chart.get('location_type'),
-                    shazamid=chart.get('shazamid'),
-                    external_url=chart.get('external_url'),
-                    applemusicid=chart.get('applemusicid'),
-                    chart_type=chart.get('chart_type'),
-                    followers_count=chart.get('followers_count'),
-                    owner_name=chart.get('owner_name'),
-                    artwork=chart.get('artwork'),
-                    deezerid=chart.get('deezerid'),
-                    deezer_userid=chart.get('deezer_userid')
-                ) for chart in data.get('charts', []) +
-                               data.get('track_charts', []) +
-                               data.get('album_charts', []) +
-                               data.get('features', [])
-            ]
-
-            videos = [
-                Video(
-                    external_id=video['external_id'],
-                    title=video.get('title', ''),
-                    view_count=video['view_count'],
-                    like_count=video['like_count'],
-                    comment_count=video['comment_count'],
-                    upload_date=video['upload_date'],
-                    image_url=video['image_url'],
-                    dislike_count=video.get('dislike_count')
-                ) for video in data.get('videos', [])
-            ]
-
-            shorts = [
-                ShortVideo(
-                    external_id=short['external_id'],
-                    title=short.get('title', ''),
-                    view_count=short['view_count'],
-                    like_count=short['like_count'],
-                    comment_count=short['comment_count'],
-                    upload_date=short['upload_date'],
-                    image_url=short['image_url']
-                ) for short in data.get('shorts', [])
-            ]
-
-            stats.append(TrackStats(
-                source=source,
-                streams_total=data.get('streams_total'),
-                popularity_current=data.get('popularity_current'),
-                playlists_current=data.get('playlists_current'),
-                playlists_total=data.get('playlists_total'),
-                playlists_editorial_current=data.get('playlists_editorial_current'),
-                playlists_editorial_total=data.get('playlists_editorial_total'),
-                playlist_reach_current=data.get('playlist_reach_current'),
-                playlist_reach_total=data.get('playlist_reach_total'),
-                charts_current=data.get('charts_current'),
-                charts_total=data.get('charts_total'),
-                shazams_total=data.get('shazams_total'),
-                engagement_rate_total=data.get('engagement_rate_total'),
-                videos_total=data.get('videos_total'),
-                video_views_total=data.get('video_views_total'),
-                video_likes_total=data.get('video_likes_total'),
-                video_comments_total=data.get('video_comments_total'),
-                shorts_total=data.get('shorts_total'),
-                short_views_total=data.get('short_views_total'),
-                short_likes_total=data.get('short_likes_total'),
-                short_comments_total=data.get('short_comments_total'),
-                creator_reach_total=data.get('creator_reach_total'),
-                favorites_total=data.get('favorites_total'),
-                reposts_total=data.get('reposts_total'),
-                playlists=playlists,
-                charts=charts,
-                videos=videos,
-                shorts=shorts
-            ))
-        return stats
-
-    def _get(self, endpoint: str, params: Dict[str, Any]) -> requests.Response:
-        url = f"{self.base_url}{endpoint}"
-        for _ in range(3):
-            res = self.session.get(url, params=params)
-            if res.status_code == 200:
-                return res
-            elif res.status_code == 429:
-                time.sleep(2)
-            elif res.status_code in error_map:
-                raise error_map[res.status_code].from_response(res)
-            else:
-                raise APIError.from_response(res)
-        raise RateLimitException("Rate limit exceeded after retries.")
-
-
-class ArtistEndpoints:
-    def __init__(self, session, base_url):
-        self.session = session
-        self.base_url = base_url.rstrip('/')
-
-    def info(self, artist_id: str) -> ArtistInfo:
-        response = self._get("/artists/info", {"songstats_artist_id": artist_id})
-        data = response.json()
-        artist_data = data['artist_info']
-
-        links = [
-            Link(
-                source=link['source'],
-                external_id=link['external_id'],
-                url=link['url']
-            ) for link in artist_data.get('links', [])
-        ]
-
-        related_artists = [
-            ArtistInfo(
-                name=artist['name'],
-                songstats_artist_id=artist['songstats_artist_id'],
-                avatar=artist.get('avatar'),
-                site_url=artist.get('site_url')
-            ) for artist in artist_data.get('related_artists', [])
-        ]
 
-        return ArtistInfo(
-            songstats_artist_id=artist_data['songstats_artist_id'],
-            name=artist_data['name'],
-            avatar=artist_data.get('avatar'),
-            site_url=artist_data.get('site_url'),
-            country=artist_data.get('country'),
-            bio=artist_data.get('bio'),
-            genres=artist_data.get('genres', []),
-            links=links,
-            related_artists=related_artists
-        )
-
-    def _get(self, endpoint: str, params: Dict[str, Any]) -> requests.Response:
-        url = f"{self.base_url}{endpoint}"
-        res = self.session.get(url, params=params)
-        if res.status_code == 200:
-            return res
-        elif res.status_code in error_map:
-            raise error_map[res.status_code].from_response(res)
-        else:
-            raise APIError.from_response(res)
-
-
-class StatusEndpoints:
-    def __init__(self, session, base_url):
-        self.session = session
-        self.base_url = base_url.rstrip('/')
-
-    def info(self) -> Dict[str, Any]:
-        response = self._get("/status")
-        return response.json()['status']
-
-    def _get(self, endpoint: str) -> requests.Response:
-        url = f"{self.base_url}{endpoint}"
-        res = self.session.get(url)
-        if res.status_code == 200:
-            return res
-        elif res.status_code in error_map:
-            raise error_map[res.status_code].from_response(res)
-        else:
-            raise APIError.from_response(res)
-
-
-class CollaboratorEndpoints:
-    def __init__(self, session, base_url):
-        self.session = session
-        self.base_url = base_url.rstrip('/')
-
-    def top_tracks(
-            self,
-            songstats_collaborator_id: Optional[str] = None,
-            tidal_artist_id: Optional[str] = None,
-            limit: Optional[int] = None,
-            metric: Optional[str] = 'streams',
-            scope: Optional[str] = 'total',
-            source: Optional[str] = 'spotify',
-    ) -> Dict[str, Any]:
-        """
-        Retrieve top tracks for a collaborator.
-
-        Endpoint:
-            https://api.songstats.com/enterprise/v1/collaborators/top_tracks
-
-        Parameters:
-            songstats_collaborator_id (str, optional): Songstats collaborator ID
-            tidal_artist_id (str, optional): TIDAL artist ID
-            limit (int, optional): Number of results to return
-            metric (str, optional): Metric to use (e.g. 'playlists', 'streams', ...)
-            scope (str, optional): Scope for metric (e.g. 'total', 'daily', ...)
-            source (str, optional): Source (e.g. 'spotify', 'apple_music', ...)
-        """
-        if not songstats_collaborator_id and not tidal_artist_id:
-            raise ParameterError(
-                "At least one of 'songstats_collaborator_id' or 'tidal_artist_id' must be provided."
-            )
-
-        params: Dict[str, Any] = {}
-        if songstats_collaborator_id:
-            params["songstats_collaborator_id"] = songstats_collaborator_id
-        if tidal_artist_id:
-            params["tidal_artist_id"] = tidal_artist_id
-        if limit is not None:
-            params["limit"] = limit
-        if metric is not None:
-            params["metric"] = metric
-        if scope is not None:
-            params["scope"] = scope
-        if source is not None:
-            params["source"] = source
-
-        res = self._get("/collaborators/top_tracks", params)
-        data = res.json()
-
-        # Alle Track-Einträge aus data[*].top_tracks zu einer flachen Liste zusammenführen
-        flat_top_tracks = []
-        for entry in data.get("data", []):
-            for track in entry.get("top_tracks", []):
-                flat_top_tracks.append(track)
-
-        return {
-            "result": data.get("result"),
-            "message": data.get("message"),
-            "data": data.get("data", []),  # Originalstruktur beibehalten
-            "top_tracks": flat_top_tracks,
-            "collaborator_info": data.get("collaborator_info", {}),
-            "source_ids": data.get("source_ids", []),
-        }
-
-    def info(
-            self,
-            songstats_collaborator_id: Optional[str] = None,
-            tidal_artist_id: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """
-        Retrieve detailed info for a collaborator.
-
-        Endpoint:
-            https://api.songstats.com/enterprise/v1/collaborators/info
-
-        Parameters:
-            songstats_collaborator_id (str, optional): Songstats collaborator ID
-            tidal_artist_id (str, optional): TIDAL artist ID
-        """
-        if not songstats_collaborator_id and not tidal_artist_id:
-            raise ParameterError(
-                "At least one of 'songstats_collaborator_id' or 'tidal_artist_id' must be provided."
-            )
-
-        params: Dict[str, Any] = {}
-        if songstats_collaborator_id:
-            params["songstats_collaborator_id"] = songstats_collaborator_id
-        if tidal_artist_id:
-            params["tidal_artist_id"] = tidal_artist_id
-
-        res = self._get("/collaborators/info", params)
-        data = res.json()
-
-        return {
-            "result": data.get("result"),
-            "message": data.get("message"),
-            "collaborator_info": data.get("collaborator_info", {}),
-        }
-
-    def catalog(
-            self,
-            songstats_collaborator_id: Optional[str] = None,
-            tidal_artist_id: Optional[str] = None,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-            with_links: bool = False
-    ) -> Dict[str, Any]:
-        """
-        Retrieve the catalog for a collaborator.
-
-        At least one of songstats_collaborator_id or tidal_artist_id must be provided.
-        """
-        if not songstats_collaborator_id and not tidal_artist_id:
-            raise ParameterError(
-                'At least one of songstats_collaborator_id or tidal_artist_id must be provided!'
-            )
-
-        params: Dict[str, Any] = {}
-        if songstats_collaborator_id:
-            params['songstats_collaborator_id'] = songstats_collaborator_id
-        if tidal_artist_id:
-            params['tidal_artist_id'] = tidal_artist_id
-        if limit is not None:
-            params['limit'] = limit
-        if offset is not None:
-            params['offset'] = offset
-        if with_links:
-            params['with_links'] = True
-
-        res = self._get("/collaborators/catalog", params)
-        data = res.json()
-
-        catalog_items: List[TrackInfo] = []
-
-        for item in data.get('catalog', []):
-            # Artists
-            artists: List[ArtistInfo] = []
-            for artist in item.get('artists', []):
-                artists.append(
-                    ArtistInfo(
-                        name=artist.get('name'),
-                        songstats_artist_id=artist.get('songstats_artist_id'),
-                        avatar=artist.get('avatar'),
-                        site_url=artist.get('site_url'),
-                    )
-                )
-
-            # ISRCs & weitere Felder direkt übernehmen
-            isrcs = item.get('isrcs', []) or []
-            labels = item.get('labels', []) or []
-            distributors = item.get('distributors', []) or []
-            genres = item.get('genres', []) or []
-            # In catalog request, no links are given, only pure ISRCs
-            links = [Link(isrc=i, external_id="", source="", url="") for i in isrcs]
-            collaborators = item.get('collaborators', []) or []
-            audio_features = item.get('audio_features', []) or []
-
-            catalog_items.append(
-                TrackInfo(
-                    songstats_track_id=item.get('songstats_track_id'),
-                    title=item.get('title'),
-                    artists=artists,
-                    release_date=item.get('release_date'),
-                    avatar=item.get('avatar'),
-                    site_url=item.get('site_url'),
-                    labels=labels,
-                    distributors=distributors,
-                    genres=genres,
-                    links=links,
-                    collaborators=collaborators,
-                    audio_features=audio_features,
-                )
-            )
-
-        return {
-            'result': data.get('result'),
-            'message': data.get('message'),
-            'catalog': catalog_items,
-            'collaborator_info': data.get('collaborator_info', {}),
-            'tracks_total': data.get('tracks_total', 0),
-            'next_url': data.get('next_url'),
-        }
-
-    def search(
-            self,
-            q: str,
-            limit: Optional[int] = None,
-            offset: Optional[int] = None,
-    ) -> Dict[str, Any]:
-        """
-        Search collaborators by name and return possible matches.
-
-        Endpoint:
-            https://api.songstats.com/enterprise/v1/collaborators/search
-
-        Parameters:
-            q (str): Search query (required)
-            limit (int, optional): Number of results to return
-            offset (int, optional): Offset for pagination
-        """
-        if not q or not q.strip():
-            raise ParameterError("Parameter 'q' (search query) is required.")
-
-        params: Dict[str, Any] = {"q": q.strip()}
-        if limit is not None:
-            params["limit"] = limit
-        if offset is not None:
-            params["offset"] = offset
-
-        res = self._get("/collaborators/search", params)
-        data = res.json()
-
-        return {
-            "result": data.get("result"),
-            "message": data.get("message"),
-            "results": data.get("results", []),
-        }
-
-    def _get(self, endpoint: str, params: Dict[str, Any]) -> requests.Response:
-        url = f"{self.base_url}{endpoint}"
-        for _ in range(3):
-            res = self.session.get(url, params=params)
-            if res.status_code == 200:
-                return res
-            elif res.status_code == 429:
-                time.sleep(2)
-            elif res.status_code in error_map:
-                raise error_map[res.status_code].from_response(res)
-            else:
-                raise APIError.from_response(res)
-        raise RateLimitException("Rate limit exceeded after retries.")
+def __getattr__(name: str):
+    if name in _ENDPOINTS:
+        from . import endpoints
+        return getattr(endpoints, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class SongstatsClient:
-    def __init__(self, api_key: Optional[str] = None, testing: bool = False):
+    def __init__(
+            self,
+            api_key: Optional[str] = None,
+            testing: bool = False,
+            identity_map: Union[bool, 'IdentityMap', None] = None,
+            name_index: Union[bool, 'NameIndex', None] = None,
+            api_keys: Union[Sequence[str], 'KeyPool', None] = None,
+            rate_limiter: Union['RateLimiter', 'SharedRateLimiter', None] = None,
+            hedging: Union[bool, 'HedgePolicy', None] = None,
+    ):
         """
         Initialize the Songstats API client
 
+        The HTTP session and the endpoint groups are created on first use.
+
         Args:
             api_key: Your Songstats API key (ignored in testing mode)
             testing: If True, uses the mock API endpoint with fixed test key (default: False)
+            identity_map: True or an IdentityMap to share one ArtistInfo/Label/Collaborator
+                instance per Songstats ID across all parsed responses (default: None)
+            name_index: True or a NameIndex recording every collaborator and artist name
+                seen, for local lookups via collaborator.search(local_first=True) (default: None)
+            api_keys: Several API keys, or a KeyPool, to spread requests over instead of
+                a single api_key (default: None)
+            rate_limiter: Limiter every request goes through, e.g. a SharedRateLimiter to
+                share one budget and 429 backoff between processes (default: None)
+            hedging: True or a HedgePolicy to send a duplicate request when track/artist info
+                is slower than usual and use the first response (default: None)
         """
-        self.session = requests.Session()
-
         if testing:
             self.base_url = BASE_URL_TEST
             api_key = "123"  # Fixed test key
+            api_keys = None
         else:
-            if not api_key:
+            if not api_key and not api_keys:
                 raise ValueError("API key is required for production mode")
             self.base_url = BASE_URL_PROD
 
-        self.session.headers.update({
-            "Accept": "application/json",
-            "apikey": api_key
-        })
+        self._api_key = api_key
+        self._api_keys = api_keys
+        self._rate_limiter = rate_limiter
+        self._hedging = hedging
+        self._key_pool: Optional['KeyPool'] = None
+        self.__session = None
+
+        if identity_map is True:
+            from .identity import IdentityMap
+            identity_map = IdentityMap()
+        elif identity_map is False:
+            identity_map = None
+        self.identity_map = identity_map
+
+        if name_index is True:
+            from .search_index import NameIndex
+            name_index = NameIndex()
+        elif name_index is False:
+            name_index = None
+        self.name_index = name_index
+
+        self._track = None
+        self._status = None
+        self._artist = None
+        self._collaborator = None
 
-        self._track = TrackEndpoints(self.session, self.base_url)
-        self._status = StatusEndpoints(self.session, self.base_url)
-        self._artist = ArtistEndpoints(self.session, self.base_url)
-        self._collaborator = CollaboratorEndpoints(self.session, self.base_url)
+    @property
+    def _session(self):
+        return self._ensure_session()
+
+    @_session.setter
+    def _session(self, session) -> None:
+        self.__session = session
 
     @property
-    def track(self) -> TrackEndpoints:
+    def session(self):
+        return self._ensure_session()
+
+    @session.setter
+    def session(self, session) -> None:
+        # Endpoint groups built after this use the assigned session
+        self.__session = session
+
+    @property
+    def key_pool(self) -> Optional['KeyPool']:
+        if self._api_keys:
+            # The pool is created together with the session
+            self._ensure_session()
+        return self._key_pool
+
+    def _ensure_session(self):
+        """Build the session chain on first use and return it."""
+        if self.__session is None:
+            self.__session = self._build_session()
+        return self.__session
+
+    def _build_session(self):
+        import requests
+
+        session = requests.Session()
+        if self._rate_limiter is not None:
+            from .ratelimit import RateLimitedSession
+            # A pooled key's 429 is handled by the pool's per-key limiter;
+            # penalizing the shared limiter would stall the healthy keys too.
+            session = RateLimitedSession(session, self._rate_limiter, penalize=not self._api_keys)
+
+        if self._api_keys:
+            from .keypool import KeyPool
+            pool = self._api_keys
+            if not isinstance(pool, KeyPool):
+                pool = KeyPool(pool, session=session)
+            self._key_pool = pool
+            session = pool
+            session.headers.update({"Accept": "application/json"})
+        else:
+            session.headers.update({
+                "Accept": "application/json",
+                "apikey": self._api_key
+            })
+
+        if self._hedging:
+            from .hedging import HedgedSession, HedgePolicy
+            session = HedgedSession(session, self._hedging if isinstance(self._hedging, HedgePolicy) else None)
+        return session
+
+    @property
+    def track(self) -> 'TrackEndpoints':
+        if self._track is None:
+            from .endpoints import TrackEndpoints
+            self._track = TrackEndpoints(self._session, self.base_url, self.identity_map, self.name_index)
         return self._track
 
     @property
-    def status(self) -> StatusEndpoints:
+    def status(self) -> 'StatusEndpoints':
+        if self._status is None:
+            from .endpoints import StatusEndpoints
+            self._status = StatusEndpoints(self._session, self.base_url)
         return self._status
 
     @property
-    def artist(self) -> ArtistEndpoints:
+    def artist(self) -> 'ArtistEndpoints':
+        if self._artist is None:
+            from .endpoints import ArtistEndpoints
+            self._artist = ArtistEndpoints(self._session, self.base_url, self.identity_map, self.name_index)
         return self._artist
 
     @property
-    def collaborator(self) -> CollaboratorEndpoints:
+    def collaborator(self) -> 'CollaboratorEndpoints':
+        if self._collaborator is None:
+            from .endpoints import CollaboratorEndpoints
+            self._collaborator = CollaboratorEndpoints(
+                self._session, self.base_url, self.identity_map, self.name_index
+            )
         return self._collaborator
+
+    def refresh_quota(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read the quota state of every pooled API key from the status endpoint.
+
+        Returns the status per key, keyed by ``key_name(api_key)`` so the keys
+        themselves do not end up in logs; the pool uses it to prefer the least
+        used keys. Keys whose status request fails are left out (and ejected on
+        401/403/429).
+        """
+        from .endpoints import StatusEndpoints
+        from .exceptions import APIError
+        from .ratelimit import key_name
+
+        if self.key_pool is None:
+            return {key_name(self._api_key): self.status.info()}
+        quotas = {}
+        for state in self.key_pool.keys:
+            try:
+                status = StatusEndpoints(self.key_pool.bound(state.key), self.base_url).info()
+            except APIError:
+                continue
+            self.key_pool.set_quota(state.key, status)
+            quotas[key_name(state.key)] = status
+        return quotas
@@ -0,0 +1,457 @@
+import dataclasses
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import requests
+from .exceptions import error_map, APIError, RateLimitException, ParameterError
+from .identity import IdentityMap
+from .models import TrackInfo, TrackStats, HistoricStats, ArtistInfo, Activity, Playlist
+from .search_index import COLLABORATOR, NameIndex
+from .parsing import (
+    parse_track_info, parse_stats, parse_catalog_item,
+    decode_historic_stats, decode_activity, decode_artist, decode_playlist
+)
+from .streaming import ANY, ItemStream, stream_items
+
+TRACK_STATS_FIELDS = frozenset(f.name for f in dataclasses.fields(TrackStats))
+
+
+def check_track_stats_fields(fields: Optional[Sequence[str]]) -> None:
+    """Raise ParameterError for names in ``fields`` that are not TrackStats fields."""
+    if fields is not None:
+        unknown = set(fields) - TRACK_STATS_FIELDS
+        if unknown:
+            raise ParameterError(f"Unknown TrackStats fields: {', '.join(sorted(unknown))}")
+
+
+class TrackEndpoints:
+    def __init__(
+            self,
+            session,
+            base_url,
+            identity_map: Optional[IdentityMap] = None,
+            name_index: Optional[NameIndex] = None,
+    ):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.identity_map = identity_map
+        self.name_index = name_index
+
+    def info(self, isrc: str = None, spotify_id: str = None) -> TrackInfo:
+        if not isrc and not spotify_id:
+            raise ParameterError('At least one of isrc or spotify_id must be provided!')
+        if isrc:
+            response = self._get("/tracks/info", {"isrc": isrc})
+        else:
+            response = self._get("/tracks/info", {"spotify_track_id": spotify_id})
+        data = response.json()
+        track = self._parse_track_info(data)
+        if self.name_index is not None:
+            self.name_index.add_track(track)
+        return track
+
+    def current_stats(
+            self,
+            isrc: str,
+            sources: Optional[Sequence[str]] = None,
+            fields: Optional[Sequence[str]] = None,
+    ) -> List[TrackStats]:
+        """
+        Retrieve current stats of a track.
+
+        Parameters:
+            isrc (str): Track ISRC
+            sources (list, optional): Only request and parse these sources (e.g. ['spotify'])
+            fields (list, optional): Only parse these TrackStats fields (e.g. ['streams_total']);
+                nested lists such as 'playlists' are skipped unless listed
+        """
+        check_track_stats_fields(fields)
+        params: Dict[str, Any] = {"isrc": isrc}
+        if sources:
+            params["source"] = ",".join(sources)
+        response = self._get("/tracks/stats", params)
+        data = response.json()
+        return self._parse_stats(data['stats'], sources, fields)
+
+    def historic_stats(self, isrc: str) -> Dict[str, List[HistoricStats]]:
+        response = self._get("/tracks/historic_stats", {"isrc": isrc})
+        data = response.json()
+        return {
+            source['source']: [decode_historic_stats(entry) for entry in source['data']['history']]
+            for source in data['stats']
+        }
+
+    def latest_activities(self, isrc: str, editorial: bool = False) -> List[Activity]:
+        response = self._get("/tracks/activities", {
+            "isrc": isrc,
+            "editorial": str(editorial).lower()
+        })
+        data = response.json()
+        return [decode_activity(activity) for activity in data['activities']]
+
+    def stream_playlists(self, isrc: str) -> ItemStream[Tuple[str, Playlist]]:
+        """
+        Stream the playlists of a track's current stats as ``(source, Playlist)`` pairs.
+
+        The response body is read and parsed incrementally, so memory stays bounded
+        for tracks with very large playlist lists. Other collections in the
+        response are skipped. If a stats entry lists its 'source' after its data,
+        that entry's playlists are buffered until the source has been read.
+        """
+        response = self._get("/tracks/stats", {"isrc": isrc}, stream=True)
+        return stream_items(
+            response,
+            ('stats', ANY, 'data', 'playlists'),
+            self._source_playlist,
+            require=('source',),
+        )
+
+    @staticmethod
+    def _source_playlist(parents: Tuple[Dict[str, Any], ...], item: Dict[str, Any]) -> Tuple[str, Playlist]:
+        if 'source' not in parents[1]:
+            raise ValueError("Stats entry without a 'source' in the response")
+        return parents[1]['source'], decode_playlist(item)
+
+    def _parse_track_info(self, data: Dict[str, Any]) -> TrackInfo:
+        return parse_track_info(data, self.identity_map)
+
+    def _parse_stats(
+            self,
+            stats_data: List[Dict[str, Any]],
+            sources: Optional[Sequence[str]] = None,
+            fields: Optional[Sequence[str]] = None,
+    ) -> List[TrackStats]:
+        return parse_stats(stats_data, self.identity_map, sources, fields)
+
+    def _get(self, endpoint: str, params: Dict[str, Any], **kwargs) -> requests.Response:
+        url = f"{self.base_url}{endpoint}"
+        for _ in range(3):
+            res = self.session.get(url, params=params, **kwargs)
+            if res.status_code == 200:
+                return res
+            elif res.status_code == 429:
+                res.close()
+                time.sleep(2)
+            elif res.status_code in error_map:
+                raise error_map[res.status_code].from_response(res)
+            else:
+                raise APIError.from_response(res)
+        raise RateLimitException("Rate limit exceeded after retries.")
+
+
+class ArtistEndpoints:
+    def __init__(
+            self,
+            session,
+            base_url,
+            identity_map: Optional[IdentityMap] = None,
+            name_index: Optional[NameIndex] = None,
+    ):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.identity_map = identity_map
+        self.name_index = name_index
+
+    def info(self, artist_id: str) -> ArtistInfo:
+        response = self._get("/artists/info", {"songstats_artist_id": artist_id})
+        data = response.json()
+        artist = decode_artist(data['artist_info'], self.identity_map)
+        if self.name_index is not None:
+            self.name_index.add_artist(artist)
+        return artist
+
+    def _get(self, endpoint: str, params: Dict[str, Any]) -> requests.Response:
+        url = f"{self.base_url}{endpoint}"
+        res = self.session.get(url, params=params)
+        if res.status_code == 200:
+            return res
+        elif res.status_code in error_map:
+            raise error_map[res.status_code].from_response(res)
+        else:
+            raise APIError.from_response(res)
+
+
+class StatusEndpoints:
+    def __init__(self, session, base_url):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+
+    def info(self) -> Dict[str, Any]:
+        response = self._get("/status")
+        return response.json()['status']
+
+    def _get(self, endpoint: str) -> requests.Response:
+        url = f"{self.base_url}{endpoint}"
+        res = self.session.get(url)
+        if res.status_code == 200:
+            return res
+        elif res.status_code in error_map:
+            raise error_map[res.status_code].from_response(res)
+        else:
+            raise APIError.from_response(res)
+
+
+class CollaboratorEndpoints:
+    def __init__(
+            self,
+            session,
+            base_url,
+            identity_map: Optional[IdentityMap] = None,
+            name_index: Optional[NameIndex] = None,
+    ):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.identity_map = identity_map
+        self.name_index = name_index
+
+    def top_tracks(
+            self,
+            songstats_collaborator_id: Optional[str] = None,
+            tidal_artist_id: Optional[str] = None,
+            limit: Optional[int] = None,
+            metric: Optional[str] = 'streams',
+            scope: Optional[str] = 'total',
+            source: Optional[str] = 'spotify',
+    ) -> Dict[str, Any]:
+        """
+        Retrieve top tracks for a collaborator.
+
+        Endpoint:
+            https://api.songstats.com/enterprise/v1/collaborators/top_tracks
+
+        Parameters:
+            songstats_collaborator_id (str, optional): Songstats collaborator ID
+            tidal_artist_id (str, optional): TIDAL artist ID
+            limit (int, optional): Number of results to return
+            metric (str, optional): Metric to use (e.g. 'playlists', 'streams', ...)
+            scope (str, optional): Scope for metric (e.g. 'total', 'daily', ...)
+            source (str, optional): Source (e.g. 'spotify', 'apple_music', ...)
+        """
+        if not songstats_collaborator_id and not tidal_artist_id:
+            raise ParameterError(
+                "At least one of 'songstats_collaborator_id' or 'tidal_artist_id' must be provided."
+            )
+
+        params: Dict[str, Any] = {}
+        if songstats_collaborator_id:
+            params["songstats_collaborator_id"] = songstats_collaborator_id
+        if tidal_artist_id:
+            params["tidal_artist_id"] = tidal_artist_id
+        if limit is not None:
+            params["limit"] = limit
+        if metric is not None:
+            params["metric"] = metric
+        if scope is not None:
+            params["scope"] = scope
+        if source is not None:
+            params["source"] = source
+
+        res = self._get("/collaborators/top_tracks", params)
+        data = res.json()
+
+        # Alle Track-Einträge aus data[*].top_tracks zu einer flachen Liste zusammenführen
+        flat_top_tracks = []
+        for entry in data.get("data", []):
+            for track in entry.get("top_tracks", []):
+                flat_top_tracks.append(track)
+
+        return {
+            "result": data.get("result"),
+            "message": data.get("message"),
+            "data": data.get("data", []),  # Originalstruktur beibehalten
+            "top_tracks": flat_top_tracks,
+            "collaborator_info": data.get("collaborator_info", {}),
+            "source_ids": data.get("source_ids", []),
+        }
+
+    def info(
+            self,
+            songstats_collaborator_id: Optional[str] = None,
+            tidal_artist_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Retrieve detailed info for a collaborator.
+
+        Endpoint:
+            https://api.songstats.com/enterprise/v1/collaborators/info
+
+        Parameters:
+            songstats_collaborator_id (str, optional): Songstats collaborator ID
+            tidal_artist_id (str, optional): TIDAL artist ID
+        """
+        if not songstats_collaborator_id and not tidal_artist_id:
+            raise ParameterError(
+                "At least one of 'songstats_collaborator_id' or 'tidal_artist_id' must be provided."
+            )
+
+        params: Dict[str, Any] = {}
+        if songstats_collaborator_id:
+            params["songstats_collaborator_id"] = songstats_collaborator_id
+        if tidal_artist_id:
+            params["tidal_artist_id"] = tidal_artist_id
+
+        res = self._get("/collaborators/info", params)
+        data = res.json()
+        if self.name_index is not None:
+            self.name_index.add_dict(data.get("collaborator_info"))
+
+        return {
+            "result": data.get("result"),
+            "message": data.get("message"),
+            "collaborator_info": data.get("collaborator_info", {}),
+        }
+
+    def catalog(
+            self,
+            songstats_collaborator_id: Optional[str] = None,
+            tidal_artist_id: Optional[str] = None,
+            limit: Optional[int] = None,
+            offset: Optional[int] = None,
+            with_links: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Retrieve the catalog for a collaborator.
+
+        At least one of songstats_collaborator_id or tidal_artist_id must be provided.
+        """
+        if not songstats_collaborator_id and not tidal_artist_id:
+            raise ParameterError(
+                'At least one of songstats_collaborator_id or tidal_artist_id must be provided!'
+            )
+
+        params: Dict[str, Any] = {}
+        if songstats_collaborator_id:
+            params['songstats_collaborator_id'] = songstats_collaborator_id
+        if tidal_artist_id:
+            params['tidal_artist_id'] = tidal_artist_id
+        if limit is not None:
+            params['limit'] = limit
+        if offset is not None:
+            params['offset'] = offset
+        if with_links:
+            params['with_links'] = True
+
+        res = self._get("/collaborators/catalog", params)
+        data = res.json()
+
+        catalog_items: List[TrackInfo] = [
+            parse_catalog_item(item, self.identity_map) for item in data.get('catalog', [])
+        ]
+        if self.name_index is not None:
+            self.name_index.add_dict(data.get('collaborator_info'))
+            for track in catalog_items:
+                self.name_index.add_track(track)
+
+        return {
+            'result': data.get('result'),
+            'message': data.get('message'),
+            'catalog': catalog_items,
+            'collaborator_info': data.get('collaborator_info', {}),
+            'tracks_total': data.get('tracks_total', 0),
+            'next_url': data.get('next_url'),
+        }
+
+    def stream_catalog(
+            self,
+            songstats_collaborator_id: Optional[str] = None,
+            tidal_artist_id: Optional[str] = None,
+            limit: Optional[int] = None,
+            offset: Optional[int] = None,
+    ) -> ItemStream[TrackInfo]:
+        """
+        Stream the catalog for a collaborator, yielding TrackInfo items as they are parsed.
+
+        The response body is read and parsed incrementally, so memory stays bounded
+        regardless of page size. Top-level fields such as 'tracks_total' and
+        'next_url' are available in the returned stream's 'meta' once it is exhausted.
+        """
+        if not songstats_collaborator_id and not tidal_artist_id:
+            raise ParameterError(
+                'At least one of songstats_collaborator_id or tidal_artist_id must be provided!'
+            )
+
+        params: Dict[str, Any] = {}
+        if songstats_collaborator_id:
+            params['songstats_collaborator_id'] = songstats_collaborator_id
+        if tidal_artist_id:
+            params['tidal_artist_id'] = tidal_artist_id
+        if limit is not None:
+            params['limit'] = limit
+        if offset is not None:
+            params['offset'] = offset
+
+        res = self._get("/collaborators/catalog", params, stream=True)
+        return stream_items(res, ('catalog',), lambda parents, item: self._catalog_item(item))
+
+    def _catalog_item(self, item: Dict[str, Any]) -> TrackInfo:
+        track = parse_catalog_item(item, self.identity_map)
+        if self.name_index is not None:
+            self.name_index.add_track(track)
+        return track
+
+    def search(
+            self,
+            q: str,
+            limit: Optional[int] = None,
+            offset: Optional[int] = None,
+            local_first: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Search collaborators by name and return possible matches.
+
+        Endpoint:
+            https://api.songstats.com/enterprise/v1/collaborators/search
+
+        Parameters:
+            q (str): Search query (required)
+            limit (int, optional): Number of results to return
+            offset (int, optional): Offset for pagination
+            local_first (bool, optional): Answer from the client's name index when it
+                has matches and only call the API on a miss (default: False)
+        """
+        if not q or not q.strip():
+            raise ParameterError("Parameter 'q' (search query) is required.")
+
+        if local_first and self.name_index is not None and not offset:
+            matches = self.name_index.search(q, limit=limit or 10, kinds=(COLLABORATOR,))
+            if matches:
+                return {
+                    "result": "success",
+                    "message": "local",
+                    "results": [
+                        {"name": m.name, "songstats_collaborator_id": m.id} for m in matches
+                    ],
+                }
+
+        params: Dict[str, Any] = {"q": q.strip()}
+        if limit is not None:
+            params["limit"] = limit
+        if offset is not None:
+            params["offset"] = offset
+
+        res = self._get("/collaborators/search", params)
+        data = res.json()
+
+        if self.name_index is not None:
+            for result in data.get("results", []):
+                self.name_index.add_dict(result)
+
+        return {
+            "result": data.get("result"),
+            "message": data.get("message"),
+            "results": data.get("results", []),
+        }
+
+    def _get(self, endpoint: str, params: Dict[str, Any], **kwargs) -> requests.Response:
+        url = f"{self.base_url}{endpoint}"
+        for _ in range(3):
+            res = self.session.get(url, params=params, **kwargs)
+            if res.status_code == 200:
+                return res
+            elif res.status_code == 429:
+                res.close()
+                time.sleep(2)
+            elif res.status_code in error_map:
+                raise error_map[res.status_code].from_response(res)
+            else:
+                raise APIError.from_response(res)
+        raise RateLimitException("Rate limit exceeded after retries.")
@@ -0,0 +1,114 @@
+"""
+Incremental activity feed.
+
+``TrackEndpoints.latest_activities`` returns the full recent list on every
+call. :class:`ActivityFeed` keeps a cursor per ISRC - the latest
+``activity_date`` seen plus short content hashes of the activities on that
+date - and only returns activities newer than the cursor. Cursors live in a
+small SQLite database so they survive restarts.
+"""
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .models import Activity
+
+HASH_SIZE = 8
+
+Cursor = Tuple[str, FrozenSet[bytes]]
+
+
+def activity_hash(activity: Activity) -> bytes:
+    """Short content hash identifying an activity."""
+    key = '\x1f'.join(str(value) for value in (
+        activity.source, activity.activity_type, activity.activity_date,
+        activity.activity_text, activity.activity_url,
+    ))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=HASH_SIZE).digest()
+
+
+class ActivityFeed:
+    """
+    Returns only activities that have not been seen before, per ISRC.
+
+    Parameters:
+        track: The client's track endpoints (``client.track``)
+        path (str, optional): SQLite file holding the cursors (default: in memory)
+        editorial (bool, optional): Passed to ``latest_activities`` (default: False)
+    """
+
+    def __init__(self, track, path: str = ':memory:', editorial: bool = False):
+        self.track = track
+        self.editorial = editorial
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cursors ("
+            "isrc TEXT PRIMARY KEY, activity_date TEXT NOT NULL, hashes BLOB NOT NULL)"
+        )
+        self._db.commit()
+
+    def poll(self, isrc: str) -> List[Activity]:
+        """Fetch the latest activities of a track and return the new ones, oldest first."""
+        return self.poll_many([isrc])[isrc]
+
+    def poll_many(self, isrcs: Iterable[str]) -> Dict[str, List[Activity]]:
+        """Poll several tracks; cursors are stored in one transaction at the end."""
+        results: Dict[str, List[Activity]] = {}
+        updates = []
+        for isrc in isrcs:
+            activities = self.track.latest_activities(isrc, editorial=self.editorial)
+            new, cursor = self._diff(self.cursor(isrc), activities)
+            results[isrc] = new
+            if new:
+                updates.append((isrc, cursor[0], b''.join(sorted(cursor[1]))))
+        if updates:
+            with self._lock, self._db:
+                self._db.executemany("INSERT OR REPLACE INTO cursors VALUES (?, ?, ?)", updates)
+        return results
+
+    def cursor(self, isrc: str) -> Optional[Cursor]:
+        """Return the stored ``(activity_date, hashes)`` cursor of a track, if any."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT activity_date, hashes FROM cursors WHERE isrc = ?", (isrc,)
+            ).fetchone()
+        if row is None:
+            return None
+        date, blob = row
+        return date, frozenset(blob[i:i + HASH_SIZE] for i in range(0, len(blob), HASH_SIZE))
+
+    def reset(self, isrc: Optional[str] = None) -> None:
+        """Forget the cursor of one track, or of all tracks."""
+        with self._lock, self._db:
+            if isrc is None:
+                self._db.execute("DELETE FROM cursors")
+            else:
+                self._db.execute("DELETE FROM cursors WHERE isrc = ?", (isrc,))
+
+    def close(self) -> None:
+        self._db.close()
+
+    @staticmethod
+    def _diff(cursor: Optional[Cursor], activities: List[Activity]) -> Tuple[List[Activity], Cursor]:
+        last_date, seen = cursor if cursor is not None else ('', frozenset())
+        new = []
+        for activity in activities:
+            date = activity.activity_date or ''
+            if date < last_date:
+                continue
+            digest = activity_hash(activity)
+            if date == last_date and digest in seen:
+                continue
+            new.append((date, digest, activity))
+
+        if not new:
+            return [], (last_date, seen)
+
+        latest = max(date for date, _, _ in new)
+        hashes = {digest for date, digest, _ in new if date == latest}
+        if latest == last_date:
+            hashes |= seen
+        new.sort(key=lambda entry: entry[0])
+        return [activity for _, _, activity in new], (latest, frozenset(hashes))
@@ -0,0 +1,174 @@
+"""
+Hedged requests for latency-sensitive endpoints.
+
+:class:`HedgedSession` wraps the session the endpoints use. When a GET to
+one of the hedged endpoints has not completed within a percentile of that
+endpoint's recent latencies, a duplicate request is sent and whichever
+response arrives first is used. Hedges go through the wrapped session, so
+they count against its rate limiter or key pool like any other request.
+
+The hedge delay is measured from the moment the primary request starts
+running, not from when it was queued. When the worker threads are busy the
+request runs on the caller's thread without a hedge, and at most
+``HedgePolicy.budget`` of all requests to hedged endpoints are duplicated,
+so load alone does not multiply upstream traffic.
+"""
+import collections
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+
+@dataclass
+class HedgePolicy:
+    """
+    When to send a hedge.
+
+    Attributes:
+        percentile: Hedge once a request is slower than this share of recent requests
+        min_samples: Latencies needed for an endpoint before it is hedged
+        window: Recent latencies kept per endpoint
+        min_delay: Never hedge sooner than this many seconds
+        endpoints: Endpoint paths that may be hedged; only idempotent GETs belong here
+        max_workers: Threads used to run primary and hedge requests
+        budget: Largest share of requests to hedged endpoints that may be hedged
+    """
+    percentile: float = 0.95
+    min_samples: int = 20
+    window: int = 200
+    min_delay: float = 0.05
+    endpoints: Tuple[str, ...] = ('/tracks/info', '/artists/info')
+    max_workers: int = 8
+    budget: float = 0.1
+
+
+class HedgedSession:
+    """Session-like wrapper sending hedged GET requests (see :class:`HedgePolicy`)."""
+
+    def __init__(self, session, policy: Optional[HedgePolicy] = None):
+        self.session = session
+        self.policy = policy or HedgePolicy()
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._busy = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.policy.max_workers,
+                                            thread_name_prefix='songstats-hedge')
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        endpoint = self._endpoint(url)
+        if endpoint is None or kwargs.get('stream'):
+            return self.session.get(url, params=params, **kwargs)
+
+        delay = self.hedge_delay(endpoint)
+        with self._lock:
+            self.requests += 1
+            # Keep a worker free for the hedge; otherwise run inline, unhedged
+            hedgeable = delay is not None and self._busy + 2 <= self.policy.max_workers
+            if hedgeable:
+                self._busy += 1
+        if not hedgeable:
+            return self._timed_get(endpoint, url, params, kwargs)
+
+        started = threading.Event()
+        primary = self._executor.submit(self._worker_get, endpoint, url, params, kwargs, started)
+        started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._reserve_hedge():
+            return primary.result()
+
+        hedge = self._executor.submit(self._worker_get, endpoint, url, params, kwargs, None)
+        winner = self._first_success(primary, hedge)
+        if winner is hedge:
+            with self._lock:
+                self.hedge_wins += 1
+        loser = primary if winner is hedge else hedge
+        loser.add_done_callback(_close_response)
+        return winner.result()
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """Seconds to wait before hedging a request to ``endpoint``; None if not hedged yet."""
+        with self._lock:
+            latencies = sorted(self._latencies.get(endpoint, ()))
+        if not latencies or len(latencies) < self.policy.min_samples:
+            return None
+        index = min(len(latencies) - 1, int(self.policy.percentile * len(latencies)))
+        return max(self.policy.min_delay, latencies[index])
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _endpoint(self, url: str) -> Optional[str]:
+        path = urlparse(url).path.rstrip('/')
+        for endpoint in self.policy.endpoints:
+            if path.endswith(endpoint):
+                return endpoint
+        return None
+
+    def _reserve_hedge(self) -> bool:
+        """Claim a worker and budget for a hedge, if both are available."""
+        with self._lock:
+            if self._busy >= self.policy.max_workers:
+                return False
+            if self.hedges + 1 > self.policy.budget * self.requests:
+                return False
+            self._busy += 1
+            self.hedges += 1
+            return True
+
+    def _worker_get(self, endpoint: str, url: str, params, kwargs, started: Optional[threading.Event]):
+        if started is not None:
+            started.set()
+        try:
+            return self._timed_get(endpoint, url, params, kwargs)
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def _timed_get(self, endpoint: str, url: str, params, kwargs):
+        start = time.monotonic()
+        res = self.session.get(url, params=params, **kwargs)
+        elapsed = time.monotonic() - start
+        with self._lock:
+            latencies = self._latencies.get(endpoint)
+            if latencies is None:
+                latencies = self._latencies[endpoint] = collections.deque(maxlen=self.policy.window)
+            latencies.append(elapsed)
+        return res
+
+    @staticmethod
+    def _first_success(primary: Future, hedge: Future) -> Future:
+        """
+        The first request to return a usable response.
+
+        Exceptions, 429s and 5xx responses only win if both requests fail;
+        then the primary's outcome is used.
+        """
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: f is not primary):
+                if _usable(future):
+                    return future
+        return primary
+
+
+def _usable(future: Future) -> bool:
+    if future.exception() is not None:
+        return False
+    status = future.result().status_code
+    return status != 429 and status < 500
+
+
+def _close_response(future: Future) -> None:
+    if future.exception() is None:
+        future.result().close()
@@ -0,0 +1,92 @@
+"""
+Identity map for entities that recur across many responses.
+
+Artists, labels and collaborators show up in thousands of ``TrackInfo``
+objects on catalog-scale workloads. An :class:`IdentityMap` hands out a
+single shared instance per Songstats ID so repeated appearances cost no
+extra memory and can be grouped by identity (``a is b``).
+
+Instances are held weakly: once no parsed object references an entity,
+it is dropped from the map.
+
+The latest response wins: when an entity shows up again with different
+non-empty values (a renamed artist, a new bio), those values are written
+into the shared instance, so every object referencing it sees them.
+Fields the new response leaves out or empty keep their current value, so
+a bare ``{name, id}`` in a track listing does not erase a full profile.
+"""
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional, Type
+
+from .models import ArtistInfo, Label, Collaborator
+
+
+def _collaborator_key(data: Dict[str, Any]) -> Optional[Hashable]:
+    # Roles are specific to a track, so only collaborators with the same
+    # roles can share an instance.
+    collaborator_id = data.get('songstats_collaborator_id')
+    if collaborator_id is None:
+        return None
+    return collaborator_id, tuple(data.get('roles') or ())
+
+
+IDENTITY_KEYS: Dict[Type, Callable[[Dict[str, Any]], Optional[Hashable]]] = {
+    ArtistInfo: lambda data: data.get('songstats_artist_id'),
+    Label: lambda data: data.get('songstats_label_id'),
+    Collaborator: _collaborator_key,
+}
+
+
+class IdentityMap:
+    """
+    Shared instances of ``ArtistInfo``, ``Label`` and ``Collaborator``.
+
+    Pass one to ``SongstatsClient(identity_map=...)`` to share instances
+    across every call of that client, or share a single map between
+    several clients. Shared instances are mutable dataclasses; changing
+    one changes it for every object that references it.
+    """
+
+    def __init__(self):
+        self._instances = {cls: weakref.WeakValueDictionary() for cls in IDENTITY_KEYS}
+        self._lock = threading.RLock()
+
+    def resolve(self, cls: Type, data: Dict[str, Any], decode: Callable[..., Any]) -> Any:
+        """
+        Return the shared instance for ``data``, decoding it on first sight.
+
+        A later appearance updates the shared instance with every non-empty
+        value it carries (see the module docstring).
+        """
+        key = IDENTITY_KEYS[cls](data)
+        if key is None:
+            return decode(data, self)
+        with self._lock:
+            instances = self._instances[cls]
+            existing = instances.get(key)
+            if existing is None:
+                existing = decode(data, self)
+                instances[key] = existing
+            elif any(value not in (None, []) and getattr(existing, name, value) != value
+                     for name, value in data.items()):
+                self._merge(existing, decode(data, self))
+            return existing
+
+    def get(self, cls: Type, key: Hashable) -> Optional[Any]:
+        """Return the shared instance of ``cls`` for ``key``, if one is alive."""
+        return self._instances[cls].get(key)
+
+    def __len__(self) -> int:
+        return sum(len(instances) for instances in self._instances.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            for instances in self._instances.values():
+                instances.clear()
+
+    @staticmethod
+    def _merge(existing: Any, fresh: Any) -> None:
+        for name, value in vars(fresh).items():
+            if value not in (None, []):
+                setattr(existing, name, value)
@@ -0,0 +1,173 @@
+"""
+Spreading requests over several API keys.
+
+A :class:`KeyPool` stands in for the ``requests.Session`` the endpoints use.
+Each request is sent with the key that can go out soonest, according to
+that key's own rate limiter and usage. Keys that answer with 401, 403 or 429
+are ejected for a while, and the request is retried with another key.
+When every key is out, a request waits for the first rate-limited key to
+come back, but fails right away if all of them were rejected (401/403).
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import requests
+
+from .exceptions import APIError, error_map
+from .ratelimit import RateLimiter, retry_after
+
+EJECT_STATUS = (401, 403, 429)
+
+
+class KeyState:
+    def __init__(self, key: str, limiter: RateLimiter):
+        self.key = key
+        self.limiter = limiter
+        self.ejected_until = 0.0
+        self.last_status: Optional[int] = None
+        self.requests = 0
+        self.quota: Dict[str, Any] = {}
+
+    @property
+    def used(self) -> int:
+        """Requests made with this key: the last known monthly total plus requests since then."""
+        return int(self.quota.get('current_month_total_requests') or 0) + self.requests
+
+    def __repr__(self):
+        return f"KeyState(key='...{self.key[-4:]}', requests={self.requests}, last_status={self.last_status})"
+
+
+class KeyPool:
+    """
+    Session-like pool of API keys with per-key rate limiting and ejection.
+
+    Parameters:
+        api_keys (Sequence[str]): The API keys to spread requests over
+        session (requests.Session, optional): Session used to send requests (default: a new session)
+        requests_per_second (float, optional): Rate limit per key (default: 10)
+        limiter_factory (callable, optional): Builds the rate limiter for a key, overriding requests_per_second
+        backoff (float, optional): Seconds a key is ejected after a 429 without Retry-After (default: 30)
+        auth_backoff (float, optional): Seconds a key is ejected after a 401/403 (default: 300)
+    """
+
+    def __init__(
+            self,
+            api_keys: Sequence[str],
+            session: Optional[requests.Session] = None,
+            requests_per_second: float = 10.0,
+            limiter_factory: Optional[Callable[[str], RateLimiter]] = None,
+            backoff: float = 30.0,
+            auth_backoff: float = 300.0,
+    ):
+        if not api_keys:
+            raise ValueError("At least one API key is required")
+        factory = limiter_factory or (lambda key: RateLimiter(requests_per_second))
+        self.keys: List[KeyState] = [KeyState(key, factory(key)) for key in dict.fromkeys(api_keys)]
+        self.session = session if session is not None else requests.Session()
+        self.backoff = backoff
+        self.auth_backoff = auth_backoff
+        self._lock = threading.Lock()
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """
+        Send a GET request with the best available key.
+
+        On 401/403/429 the key is ejected and the request is retried with each
+        other healthy key; if none is left, the last response is returned.
+        Raises Unauthorized/Forbidden if every key is ejected for a 401/403.
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        tried = set()
+        state = self._pick(tried, wait=True)
+        if state is None:
+            rejected = max(self.keys, key=lambda s: s.ejected_until)
+            status = rejected.last_status
+            raise error_map.get(status, APIError)(
+                status, f"All API keys were rejected, next retry in {rejected.ejected_until - time.monotonic():.0f}s"
+            )
+        while True:
+            tried.add(state.key)
+            state.limiter.acquire()
+            res = self.session.get(url, params=params, headers={**headers, 'apikey': state.key}, **kwargs)
+            self._record(state, res)
+            if res.status_code not in EJECT_STATUS:
+                return res
+            state = self._pick(tried, wait=False)
+            if state is None:
+                return res
+
+    def bound(self, key: str) -> 'BoundKey':
+        """A session-like view that sends every request with ``key``."""
+        return BoundKey(self, next(state for state in self.keys if state.key == key))
+
+    def set_quota(self, key: str, status: Dict[str, Any]) -> None:
+        """Store the ``StatusEndpoints.info()`` result of a key and restart its request count."""
+        for state in self.keys:
+            if state.key == key:
+                with self._lock:
+                    state.quota = dict(status)
+                    state.requests = 0
+
+    def healthy(self) -> List[KeyState]:
+        now = time.monotonic()
+        return [state for state in self.keys if state.ejected_until <= now]
+
+    def _pick(self, exclude, wait: bool) -> Optional[KeyState]:
+        """
+        Pick the healthy key that can send soonest, preferring the least used.
+
+        With ``wait=True`` and every key ejected, sleep until the first key
+        ejected for a 429 comes back instead of returning None. Keys ejected
+        for a 401/403 are not waited for.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                candidates = [s for s in self.keys if s.key not in exclude]
+                healthy = [s for s in candidates if s.ejected_until <= now]
+                if healthy:
+                    return min(healthy, key=lambda s: (s.limiter.delay(), s.used))
+                throttled = [s for s in candidates if s.last_status == 429]
+                if not wait or not throttled:
+                    return None
+                delay = min(s.ejected_until for s in throttled) - now
+            time.sleep(delay)
+
+    def _record(self, state: KeyState, res: requests.Response) -> None:
+        with self._lock:
+            state.requests += 1
+            state.last_status = res.status_code
+            if res.status_code == 429:
+                seconds = retry_after(res)
+                if seconds is None:
+                    seconds = self.backoff
+                state.ejected_until = time.monotonic() + seconds
+                state.limiter.penalize(seconds)
+            elif res.status_code in EJECT_STATUS:
+                state.ejected_until = time.monotonic() + self.auth_backoff
+
+
+class BoundKey:
+    """Session-like view of a :class:`KeyPool` pinned to one key."""
+
+    def __init__(self, pool: KeyPool, state: KeyState):
+        self.pool = pool
+        self.state = state
+
+    @property
+    def headers(self):
+        return self.pool.headers
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        self.state.limiter.acquire()
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers['apikey'] = self.state.key
+        res = self.pool.session.get(url, params=params, headers=headers, **kwargs)
+        self.pool._record(self.state, res)
+        return res
+
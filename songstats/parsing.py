@@ -0,0 +1,309 @@
+"""
+Schema-driven decoders for the API models.
+
+Every model in :mod:`songstats.models` gets a decoder generated from its
+dataclass definition. The decoder source is built and compiled once, when
+this module is imported, so parsing a payload is a straight sequence of
+``dict.get`` calls and constructor invocations with no per-field dispatch.
+Unknown keys in the payload are ignored; a missing required field (one
+without a default in the model or in ``FIELD_DEFAULTS``) raises ``KeyError``.
+
+Catalog entries are sparse, so they are parsed with a second, lenient set
+of decoders that read every field with ``dict.get``.
+
+Every decoder takes an optional :class:`~songstats.identity.IdentityMap`;
+nested artists, labels and collaborators are then resolved through it.
+
+A third set of decoders builds :func:`pack` rows straight from the payload,
+for callers that ship results between processes and never need the models.
+"""
+import dataclasses
+import functools
+import typing
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type, Union
+
+from . import models
+from .identity import IDENTITY_KEYS, IdentityMap
+from .models import (
+    TrackInfo, TrackStats, HistoricStats,
+    ArtistInfo, Activity, AudioFeature, Link,
+    Playlist, Chart, Video, ShortVideo, Label, Distributor, Collaborator
+)
+
+Decoder = Callable[..., Any]
+
+# Payload keys that feed a model field when they differ from the field name.
+# Several keys are concatenated for list fields.
+FIELD_KEYS: Dict[Type, Dict[str, Tuple[str, ...]]] = {
+    TrackStats: {
+        'charts': ('charts', 'track_charts', 'album_charts', 'features'),
+    },
+}
+
+# Defaults used for missing keys where the API omits a required field.
+FIELD_DEFAULTS: Dict[Type, Dict[str, Any]] = {
+    Video: {'title': ''},
+    ShortVideo: {'title': ''},
+    TrackInfo: {'artists': []},
+}
+
+MODELS = (
+    AudioFeature, Link, ArtistInfo, Collaborator, Label, Distributor,
+    Playlist, Chart, Video, ShortVideo, TrackStats, HistoricStats,
+    Activity, TrackInfo,
+)
+
+_namespace: Dict[str, Any] = {}
+_decoders: Dict[Type, Decoder] = {}
+_lenient_decoders: Dict[Type, Decoder] = {}
+_row_decoders: Dict[Type, Decoder] = {}
+
+
+def _decoder_name(cls: Type, strict: bool = True, rows: bool = False) -> str:
+    if rows:
+        return f"_decode_{cls.__name__}_row"
+    return f"_decode_{cls.__name__}" if strict else f"_decode_{cls.__name__}_lenient"
+
+
+def _list_item_type(tp: Any) -> Optional[Type]:
+    """Return the model type of a ``List[Model]`` annotation, if any."""
+    if typing.get_origin(tp) in (list, List):
+        args = typing.get_args(tp)
+        if args and dataclasses.is_dataclass(args[0]):
+            return args[0]
+    return None
+
+
+def _item_expr(item_type: Type, var: str, strict: bool, rows: bool = False) -> str:
+    if item_type is AudioFeature:
+        # AudioFeature carries its own value coercion.
+        return f"_AudioFeature_row({var})" if rows else f"_AudioFeature_from_dict({var})"
+    name = _decoder_name(item_type, strict, rows)
+    if rows:
+        # Rows carry no object identity to share.
+        return f"{name}({var})"
+    if item_type in IDENTITY_KEYS:
+        return f"({name}({var}, im) if im is None else im.resolve({item_type.__name__}, {var}, {name}))"
+    return f"{name}({var}, im)"
+
+
+def _generate_source(cls: Type, name: str, only: Optional[FrozenSet[str]] = None, strict: bool = True,
+                     rows: bool = False) -> str:
+    hints = typing.get_type_hints(cls, vars(models))
+    keys = FIELD_KEYS.get(cls, {})
+    defaults = FIELD_DEFAULTS.get(cls, {})
+    lines = [f"def {name}(d, im=None):", "    g = d.get"]
+    args = []
+    for f in dataclasses.fields(cls):
+        if not f.init:
+            continue
+        required = f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING
+        # Unknown keys are ignored, but a missing required key is an error.
+        read = "d" if strict and required and f.name not in defaults else "g"
+        if only is not None and f.name not in only and not required:
+            # Projected out: keep the field's default without reading the payload.
+            args.append("[]" if f.default_factory is not dataclasses.MISSING else repr(f.default))
+            continue
+        item_type = _list_item_type(hints[f.name])
+        sources = keys.get(f.name, (f.name,))
+        if item_type is not None:
+            var = f"_{f.name}"
+            expr = _item_expr(item_type, "x", strict, rows)
+            iterables = " + ".join(f"(d[{k!r}] or [])" if read == "d" else f"(g({k!r}) or [])"
+                                   for k in sources)
+            lines.append(f"    {var} = [{expr} for x in {iterables}]")
+            args.append(var)
+        elif f.default_factory is not dataclasses.MISSING:
+            args.append(f"g({sources[0]!r}) or []")
+        elif f.name in defaults:
+            args.append(f"g({sources[0]!r}, {defaults[f.name]!r})")
+        elif f.default is not dataclasses.MISSING and f.default is not None:
+            args.append(f"g({sources[0]!r}, {f.default!r})")
+        elif read == "d":
+            args.append(f"d[{sources[0]!r}]")
+        else:
+            args.append(f"g({sources[0]!r})")
+    if rows:
+        lines.append(f"    return ({', '.join(args)},)")
+    else:
+        lines.append(f"    return {cls.__name__}({', '.join(args)})")
+    return "\n".join(lines)
+
+
+def _audio_feature_row(data: Dict[str, Any]) -> tuple:
+    feature = AudioFeature.from_dict(data)
+    return feature.key, feature.value
+
+
+def _compile(classes) -> None:
+    _namespace.update({cls.__name__: cls for cls in classes})
+    _namespace['_AudioFeature_from_dict'] = AudioFeature.from_dict
+    _namespace['_AudioFeature_row'] = _audio_feature_row
+    for cls in classes:
+        if cls is AudioFeature:
+            _decoders[cls] = _lenient_decoders[cls] = AudioFeature.from_dict
+            _row_decoders[cls] = _audio_feature_row
+            continue
+        for strict, rows, decoders in ((True, False, _decoders), (False, False, _lenient_decoders),
+                                       (True, True, _row_decoders)):
+            name = _decoder_name(cls, strict, rows)
+            source = _generate_source(cls, name, strict=strict, rows=rows)
+            exec(compile(source, f"<songstats decoder {name}>", "exec"), _namespace)
+            decoders[cls] = _namespace[name]
+
+
+_compile(MODELS)
+
+
+def decoder(cls: Type) -> Decoder:
+    """Return the compiled decoder for a model class."""
+    return _decoders[cls]
+
+
+def row_decoder(cls: Type) -> Decoder:
+    """Return the compiled decoder building :func:`pack` rows for a model class."""
+    return _row_decoders[cls]
+
+
+@functools.lru_cache(maxsize=64)
+def projected_decoder(cls: Type, fields: FrozenSet[str], rows: bool = False) -> Decoder:
+    """
+    Return a decoder for ``cls`` that only reads ``fields`` from the payload.
+
+    Other fields keep their defaults; nested lists left out are never built.
+    Required fields are always decoded. With ``rows=True`` the decoder
+    returns a :func:`pack` row instead of the model.
+    """
+    unknown = fields - {f.name for f in dataclasses.fields(cls)}
+    if unknown:
+        raise ValueError(f"Unknown {cls.__name__} fields: {', '.join(sorted(unknown))}")
+    name = f"{_decoder_name(cls, rows=rows)}_projected"
+    namespace = dict(_namespace)
+    source = _generate_source(cls, name, fields, rows=rows)
+    exec(compile(source, f"<songstats decoder {cls.__name__} {sorted(fields)}>", "exec"), namespace)
+    return namespace[name]
+
+
+def decode(cls: Type, data: Dict[str, Any], identity_map: Optional[IdentityMap] = None) -> Any:
+    """Decode a single payload dict into an instance of ``cls``."""
+    if cls is AudioFeature:
+        return AudioFeature.from_dict(data)
+    if identity_map is not None and cls in IDENTITY_KEYS:
+        return identity_map.resolve(cls, data, _decoders[cls])
+    return _decoders[cls](data, identity_map)
+
+
+# Positions of List[Model] fields per model, for pack()/unpack().
+def _nested_fields(cls: Type) -> List[Tuple[int, Type]]:
+    hints = typing.get_type_hints(cls, vars(models))
+    nested = []
+    for i, f in enumerate(dataclasses.fields(cls)):
+        item_type = _list_item_type(hints[f.name])
+        if item_type is not None:
+            nested.append((i, item_type))
+    return nested
+
+
+_NESTED: Dict[Type, List[Tuple[int, Type]]] = {cls: _nested_fields(cls) for cls in MODELS}
+_FIELD_NAMES: Dict[Type, Tuple[str, ...]] = {
+    cls: tuple(f.name for f in dataclasses.fields(cls)) for cls in MODELS
+}
+
+
+def pack(obj: Any) -> tuple:
+    """
+    Flatten a model into a tuple of its field values, nested models included.
+
+    Tuples pickle far smaller and faster than dataclass instances; rebuild
+    the model with :func:`unpack`.
+    """
+    cls = type(obj)
+    values = [getattr(obj, name) for name in _FIELD_NAMES[cls]]
+    for i, _ in _NESTED[cls]:
+        values[i] = [pack(item) for item in values[i]]
+    return tuple(values)
+
+
+def unpack(cls: Type, row: tuple) -> Any:
+    """Rebuild a model of type ``cls`` from :func:`pack` output."""
+    nested = _NESTED[cls]
+    if not nested:
+        return cls(*row)
+    values = list(row)
+    for i, item_type in nested:
+        if _NESTED[item_type]:
+            values[i] = [unpack(item_type, item) for item in values[i]]
+        else:
+            values[i] = [item_type(*item) for item in values[i]]
+    return cls(*values)
+
+
+decode_track_stats_data = _decoders[TrackStats]
+decode_historic_stats = _decoders[HistoricStats]
+decode_activity = _decoders[Activity]
+decode_playlist = _decoders[Playlist]
+decode_track_info = _decoders[TrackInfo]
+
+
+def decode_artist(data: Dict[str, Any], identity_map: Optional[IdentityMap] = None) -> ArtistInfo:
+    return decode(ArtistInfo, data, identity_map)
+
+
+def parse_track_info(
+        data: Dict[str, Any],
+        identity_map: Optional[IdentityMap] = None,
+        packed: bool = False,
+) -> Union[TrackInfo, tuple]:
+    """
+    Parse a ``tracks/info`` response body.
+
+    With ``packed=True`` the :func:`pack` row is built directly, without the
+    model; ``identity_map`` is then ignored.
+    """
+    track_data = dict(data['track_info'])
+    track_data['audio_features'] = data.get('audio_analysis')
+    if packed:
+        return _row_decoders[TrackInfo](track_data)
+    return decode_track_info(track_data, identity_map)
+
+
+def parse_stats(
+        stats_data: List[Dict[str, Any]],
+        identity_map: Optional[IdentityMap] = None,
+        sources: Optional[Iterable[str]] = None,
+        fields: Optional[Iterable[str]] = None,
+        packed: bool = False,
+) -> List[Union[TrackStats, tuple]]:
+    """
+    Parse the ``stats`` list of a ``tracks/stats`` response body.
+
+    ``sources`` skips every other source; ``fields`` limits the TrackStats
+    fields that are decoded (see :func:`projected_decoder`). With
+    ``packed=True`` :func:`pack` rows are built directly, without the models;
+    ``identity_map`` is then ignored.
+    """
+    wanted = set(sources) if sources is not None else None
+    if fields is not None:
+        decode_data = projected_decoder(TrackStats, frozenset(fields), packed)
+    elif packed:
+        decode_data = _row_decoders[TrackStats]
+    else:
+        decode_data = decode_track_stats_data
+    stats = []
+    for source_data in stats_data:
+        if wanted is not None and source_data['source'] not in wanted:
+            continue
+        data = dict(source_data['data'])
+        data['source'] = source_data['source']
+        stats.append(decode_data(data, identity_map))
+    return stats
+
+
+def parse_catalog_item(item: Dict[str, Any], identity_map: Optional[IdentityMap] = None) -> TrackInfo:
+    """Parse one entry of a ``collaborators/catalog`` response body."""
+    track_data = dict(item)
+    # In catalog request, no links are given, only pure ISRCs
+    track_data['links'] = None
+    track = _lenient_decoders[TrackInfo](track_data, identity_map)
+    track.links = [Link(isrc=i, external_id="", source="", url="") for i in item.get('isrcs') or []]
+    return track
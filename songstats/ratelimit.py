@@ -0,0 +1,187 @@
+"""
+Client-side rate limiting.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Parameters:
+        rate (float): Requests per second
+        burst (int, optional): Bucket size, i.e. requests that may be sent back to back (default: rate)
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """Seconds until a request could be sent, without reserving it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            return max(wait, self._blocked_until - now)
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back all requests for ``seconds``, e.g. after a 429 response."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class SharedRateLimiter:
+    """
+    Token bucket shared by every process on a host through a SQLite file.
+
+    All limiters opened on the same ``path`` and ``name`` draw from one
+    budget, and a :meth:`penalize` from one process (e.g. after a 429) holds
+    back all of them. Updates run in ``BEGIN IMMEDIATE`` transactions, so the
+    database lock serializes them across processes.
+
+    Parameters:
+        path (str): SQLite file holding the bucket state
+        rate (float): Requests per second, shared by all processes
+        burst (int, optional): Bucket size (default: rate)
+        name (str, optional): Bucket name, to keep several budgets in one file (default: 'default')
+    """
+
+    def __init__(self, path: str, rate: float, burst: Optional[int] = None, name: str = 'default'):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.path = path
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.name = name
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, blocked_until REAL NOT NULL)"
+        )
+
+    def _update(self, take: int = 0, block_for: float = 0.0) -> float:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._db.execute(
+                    "SELECT tokens, updated, blocked_until FROM buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                tokens, updated, blocked_until = row if row is not None else (float(self.burst), now, 0.0)
+                tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - take
+                if block_for:
+                    blocked_until = max(blocked_until, now + block_for)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                    (self.name, tokens, now, blocked_until),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        wait = 0.0 if tokens >= 0 else -tokens / self.rate
+        return max(wait, blocked_until - now)
+
+    def delay(self) -> float:
+        """Seconds until a request could be sent, without reserving it."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT tokens, updated, blocked_until FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+        if row is None:
+            return 0.0
+        now = time.time()
+        tokens, updated, blocked_until = row
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+        return max(wait, blocked_until - now)
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        return self._update(take=1)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back all processes' requests for ``seconds``."""
+        self._update(block_for=seconds)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def key_name(api_key: str) -> str:
+    """Bucket name for an API key that does not store the key itself."""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+class RateLimitedSession:
+    """
+    Session-like wrapper sending every request through a rate limiter.
+
+    A 429 response penalizes the limiter for its Retry-After (or ``backoff``)
+    seconds, so with a :class:`SharedRateLimiter` every process slows down.
+    With ``penalize=False`` 429s are left to the caller, e.g. a
+    :class:`~songstats.keypool.KeyPool` that backs off per key.
+    """
+
+    def __init__(self, session, limiter, backoff: float = 2.0, penalize: bool = True):
+        self.session = session
+        self.limiter = limiter
+        self.backoff = backoff
+        self.penalize = penalize
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        self.limiter.acquire()
+        res = self.session.get(url, params=params, **kwargs)
+        if res.status_code == 429 and self.penalize:
+            self.limiter.penalize(retry_after(res) or self.backoff)
+        return res
+
+
+def retry_after(res) -> Optional[float]:
+    """Seconds from a response's Retry-After header, if it has a numeric one."""
+    try:
+        return float(res.headers.get('Retry-After'))
+    except (TypeError, ValueError, AttributeError):
+        return None
@@ -0,0 +1,210 @@
+"""
+Local name index for collaborators and artists.
+
+Every collaborator and artist name the client sees can be recorded in a
+:class:`NameIndex`. It answers prefix lookups (on the full name or any word
+in it) and fuzzy trigram lookups locally, so interactive tools only hit
+``collaborators/search`` when the index has no match.
+"""
+import bisect
+import heapq
+import json
+import threading
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .models import ArtistInfo, TrackInfo
+
+ARTIST = 'artist'
+COLLABORATOR = 'collaborator'
+
+ID_KEYS = {
+    'songstats_collaborator_id': COLLABORATOR,
+    'songstats_artist_id': ARTIST,
+}
+
+Key = Tuple[str, str]
+
+# New prefix tokens go into a side list, sorted on the next search and merged
+# into the main list once it outgrows MERGE_AT tokens and a quarter of the
+# main list, so adding a name never re-sorts the whole index.
+MERGE_AT = 4096
+
+
+class IndexEntry(NamedTuple):
+    kind: str
+    id: str
+    name: str
+    score: float
+
+
+def normalize(name: str) -> str:
+    """Casefold, strip accents and collapse whitespace."""
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.casefold().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    In-memory prefix and trigram index over collaborator and artist names.
+
+    Parameters:
+        min_score (float, optional): Minimum trigram similarity for fuzzy matches (default: 0.3)
+    """
+
+    def __init__(self, min_score: float = 0.3):
+        self.min_score = min_score
+        self._names: Dict[Key, str] = {}
+        self._prefixes: List[Tuple[str, str, str]] = []
+        self._recent: List[Tuple[str, str, str]] = []
+        self._recent_sorted = True
+        self._trigrams: Dict[str, Set[Key]] = {}
+        self._gram_counts: Dict[Key, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._names
+
+    def add(self, kind: str, id: str, name: Optional[str]) -> None:
+        """Record a name; re-adding a known ID with the same name is a no-op."""
+        if not id or not name:
+            return
+        key = (kind, id)
+        with self._lock:
+            previous = self._names.get(key)
+            if previous == name:
+                return
+            if previous is not None:
+                self._remove(key, previous)
+            self._names[key] = name
+            normalized = normalize(name)
+            for token in {normalized, *normalized.split()}:
+                self._recent.append((token, kind, id))
+            self._recent_sorted = False
+            if len(self._recent) >= max(MERGE_AT, len(self._prefixes) // 4):
+                self._merge_recent()
+            grams = trigrams(normalized)
+            self._gram_counts[key] = len(grams)
+            for gram in grams:
+                self._trigrams.setdefault(gram, set()).add(key)
+
+    def add_dict(self, data: Optional[Dict[str, Any]]) -> None:
+        """Record a raw API dict carrying a name and a collaborator or artist ID."""
+        if not data:
+            return
+        for id_key, kind in ID_KEYS.items():
+            if data.get(id_key):
+                self.add(kind, data[id_key], data.get('name'))
+
+    def add_artist(self, artist: ArtistInfo) -> None:
+        self.add(ARTIST, artist.songstats_artist_id, artist.name)
+        for related in artist.related_artists:
+            self.add(ARTIST, related.songstats_artist_id, related.name)
+
+    def add_track(self, track: TrackInfo) -> None:
+        for artist in track.artists:
+            self.add_artist(artist)
+        for collaborator in track.collaborators:
+            self.add(COLLABORATOR, collaborator.songstats_collaborator_id, collaborator.name)
+
+    def search(self, q: str, limit: int = 10, kinds: Optional[Iterable[str]] = None) -> List[IndexEntry]:
+        """
+        Look up names matching ``q``.
+
+        Prefix matches come first (score 1.0), followed by fuzzy trigram
+        matches ordered by similarity.
+        """
+        query = normalize(q)
+        if not query:
+            return []
+        kinds = set(kinds) if kinds is not None else None
+        results: Dict[Key, float] = {}
+        with self._lock:
+            for key in self._prefix_matches(query):
+                if kinds is None or key[0] in kinds:
+                    results.setdefault(key, 1.0)
+                    if len(results) >= limit:
+                        break
+            if len(results) < limit:
+                for key, score in self._fuzzy_matches(query):
+                    if key not in results and (kinds is None or key[0] in kinds):
+                        results[key] = score
+                        if len(results) >= limit:
+                            break
+            return [IndexEntry(kind, id, self._names[(kind, id)], score)
+                    for (kind, id), score in results.items()]
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            entries = [[kind, id, name] for (kind, id), name in self._names.items()]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'entries': entries}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'NameIndex':
+        index = cls(**kwargs)
+        with open(path, encoding='utf-8') as f:
+            for kind, id, name in json.load(f)['entries']:
+                index.add(kind, id, name)
+        return index
+
+    def _prefix_matches(self, query: str) -> Iterable[Key]:
+        self._sort_recent()
+        seen: Set[Key] = set()
+        matches = heapq.merge(_starting_with(self._prefixes, query), _starting_with(self._recent, query))
+        for token, kind, id in matches:
+            if (kind, id) not in seen:
+                seen.add((kind, id))
+                yield kind, id
+
+    def _sort_recent(self) -> None:
+        if not self._recent_sorted:
+            self._recent.sort()
+            self._recent_sorted = True
+
+    def _merge_recent(self) -> None:
+        # Both lists are sorted runs, which sort() merges in linear time
+        self._sort_recent()
+        self._prefixes += self._recent
+        self._prefixes.sort()
+        self._recent = []
+
+    def _fuzzy_matches(self, query: str) -> List[Tuple[Key, float]]:
+        grams = trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+        scored = []
+        for key, count in shared.items():
+            score = count / (len(grams) + self._gram_counts[key] - count)
+            if score >= self.min_score:
+                scored.append((key, score))
+        scored.sort(key=lambda item: -item[1])
+        return scored
+
+    def _remove(self, key: Key, name: str) -> None:
+        normalized = normalize(name)
+        self._prefixes = [entry for entry in self._prefixes if (entry[1], entry[2]) != key]
+        self._recent = [entry for entry in self._recent if (entry[1], entry[2]) != key]
+        for gram in trigrams(normalized):
+            keys = self._trigrams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+
+
+def _starting_with(prefixes: List[Tuple[str, str, str]], query: str) -> Iterable[Tuple[str, str, str]]:
+    """Entries of a sorted token list whose token starts with ``query``."""
+    for i in range(bisect.bisect_left(prefixes, (query,)), len(prefixes)):
+        if not prefixes[i][0].startswith(query):
+            return
+        yield prefixes[i]
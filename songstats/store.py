@@ -0,0 +1,307 @@
+"""
+Memory-mapped on-disk store for historic metric time series.
+
+A :class:`HistoricStore` is a directory holding one fixed-width float64
+column file per source and metric, plus ``index.json`` mapping ISRCs to
+columns and days to rows::
+
+    store/
+        index.json                  # start date, days, capacity, ISRCs
+        columns/spotify.streams_total.f8
+        columns/spotify.playlists_current.f8
+        ...
+
+Column files are laid out day-major: row ``d`` holds day ``start + d`` for
+every track slot, so appending new days appends to the files in place.
+Readers get zero-copy NumPy views through ``np.memmap``, and several
+processes reading the same store share the OS page cache. Days without data
+are NaN.
+
+There must be only one writer at a time. Readers call :meth:`HistoricStore.refresh`
+to see days appended since they opened the store. When the writer changes
+the layout (more track slots, or history older than the start date) it bumps
+the ``generation`` in the index; a reader still on the old layout then gets
+:class:`StaleStoreError` instead of misaligned values until it refreshes.
+
+Requires NumPy (``pip install python-songstats[numpy]``).
+"""
+import json
+import os
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError("songstats.store requires numpy: pip install python-songstats[numpy]") from e
+
+from .aggregate import METRICS
+from .models import HistoricStats
+
+INDEX_FILE = 'index.json'
+COLUMNS_DIR = 'columns'
+DTYPE = np.dtype('<f8')
+# Bytes copied at a time when a column file is rewritten for a new layout
+COPY_BLOCK = 64 * 1024 * 1024
+
+
+class StaleStoreError(RuntimeError):
+    """The store's layout changed since the last :meth:`HistoricStore.refresh`."""
+
+
+class HistoricStore:
+    """
+    Column store of historic stats, opened or created at ``path``.
+
+    Parameters:
+        path (str): Store directory
+        capacity (int, optional): Track slots per day row for a new store; doubled when full (default: 1024)
+    """
+
+    def __init__(self, path: str, capacity: int = 1024):
+        self.path = path
+        self._columns_dir = os.path.join(path, COLUMNS_DIR)
+        os.makedirs(self._columns_dir, exist_ok=True)
+        self.start: Optional[np.datetime64] = None
+        self.days = 0
+        self.capacity = capacity
+        self.generation = 0
+        self.isrcs: List[str] = []
+        self._index_stat: Optional[Tuple[int, int, int]] = None
+        self._rows: Dict[str, int] = {}
+        self._maps: Dict[Tuple[str, str], np.memmap] = {}
+        self.refresh()
+
+    # Reading
+
+    def refresh(self) -> None:
+        """Reload the index, picking up tracks and days added by a writer."""
+        index = self._read_index()
+        if index is not None:
+            self.start = np.datetime64(index['start'], 'D') if index['start'] else None
+            self.days = index['days']
+            self.capacity = index['capacity']
+            self.generation = index.get('generation', 0)
+            self.isrcs = index['isrcs']
+            self._rows = {isrc: i for i, isrc in enumerate(self.isrcs)}
+        self._maps = {}
+
+    @property
+    def dates(self) -> 'np.ndarray':
+        if self.start is None:
+            return np.array([], dtype='datetime64[D]')
+        return np.arange(self.start, self.start + self.days, dtype='datetime64[D]')
+
+    def columns(self) -> List[Tuple[str, str]]:
+        """All ``(source, metric)`` pairs stored."""
+        pairs = []
+        for name in sorted(os.listdir(self._columns_dir)):
+            if name.endswith('.f8'):
+                source, metric = name[:-3].rsplit('.', 1)
+                pairs.append((source, metric))
+        return pairs
+
+    def column(self, source: str, metric: str) -> 'np.ndarray':
+        """
+        Read-only ``(days, tracks)`` view of one metric, memory-mapped from disk.
+
+        Track ``i`` is ``store.isrcs[i]``; missing columns are all NaN.
+        """
+        key = (source, metric)
+        if key not in self._maps:
+            path = self._column_path(source, metric)
+            if not os.path.exists(path) or not self.days:
+                return np.full((self.days, len(self.isrcs)), np.nan)
+            self._check_layout(path)
+            self._maps[key] = np.memmap(path, dtype=DTYPE, mode='r', shape=(self.days, self.capacity))
+        return self._maps[key][:, :len(self.isrcs)]
+
+    def series(self, isrc: str, source: str, metric: str) -> 'np.ndarray':
+        """Daily values of one track as a (strided, zero-copy) view."""
+        return self.column(source, metric)[:, self._rows[isrc]]
+
+    def row(self, isrc: str) -> int:
+        """Column slot of a track."""
+        return self._rows[isrc]
+
+    def _check_layout(self, path: str) -> None:
+        """Raise StaleStoreError if ``path`` is not laid out as this reader expects."""
+        stat = os.stat(os.path.join(self.path, INDEX_FILE))
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) != self._index_stat:
+            index = self._read_index()
+            if index is None or index.get('generation', 0) != self.generation:
+                raise StaleStoreError(f"{self.path} was relaid out by a writer; call refresh()")
+        row_bytes = self.capacity * DTYPE.itemsize
+        size = os.path.getsize(path)
+        # Odd generations mark a relayout in progress
+        if self.generation % 2 or size % row_bytes or size < self.days * row_bytes:
+            raise StaleStoreError(f"{path} does not match the store layout; call refresh()")
+
+    def __contains__(self, isrc: str) -> bool:
+        return isrc in self._rows
+
+    def __len__(self) -> int:
+        return len(self.isrcs)
+
+    # Writing
+
+    def write(
+            self,
+            isrc: str,
+            histories: Mapping[str, Sequence[HistoricStats]],
+            metrics: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Store ``client.track.historic_stats(isrc)`` for one track.
+
+        New days are appended to the column files in place; existing days
+        are overwritten.
+        """
+        self.write_many({isrc: histories}, metrics)
+
+    def write_many(
+            self,
+            histories: Mapping[str, Mapping[str, Sequence[HistoricStats]]],
+            metrics: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Store the historic stats of several tracks, keyed by ISRC."""
+        metrics = tuple(metrics) if metrics is not None else METRICS
+        parsed = []
+        first, last = None, None
+        for isrc, by_source in histories.items():
+            for source, entries in by_source.items():
+                if not entries:
+                    continue
+                dates = np.array([e.date for e in entries], dtype='datetime64[D]')
+                parsed.append((isrc, source, entries, dates))
+                first = dates.min() if first is None else min(first, dates.min())
+                last = dates.max() if last is None else max(last, dates.max())
+        if first is None:
+            return
+
+        self._ensure_tracks(histories)
+        self._ensure_dates(first, last)
+
+        columns: Dict[Tuple[str, str], np.memmap] = {}
+        for isrc, source, entries, dates in parsed:
+            rows = (dates - self.start).astype(np.int64)
+            slot = self._rows[isrc]
+            for metric in metrics:
+                raw = [getattr(e, metric) for e in entries]
+                if all(v is None for v in raw):
+                    continue
+                key = (source, metric)
+                if key not in columns:
+                    columns[key] = self._writable(source, metric)
+                columns[key][rows, slot] = np.array(raw, dtype=float)
+
+        for column in columns.values():
+            column.flush()
+        self._save_index()
+        self._maps = {}
+
+    def _ensure_tracks(self, isrcs: Iterable[str]) -> None:
+        new = [isrc for isrc in isrcs if isrc not in self._rows]
+        if not new:
+            return
+        needed = len(self.isrcs) + len(new)
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self._relayout(self.start, self.days, capacity)
+        for isrc in new:
+            self._rows[isrc] = len(self.isrcs)
+            self.isrcs.append(isrc)
+
+    def _ensure_dates(self, first: 'np.datetime64', last: 'np.datetime64') -> None:
+        if self.start is None:
+            self.start = first
+        if first < self.start:
+            # Rare: history older than the store. Shift every column down.
+            self._relayout(first, self.days + int((self.start - first).astype(int)), self.capacity)
+        days = int((last - self.start).astype(int)) + 1
+        if days > self.days:
+            for source, metric in self.columns():
+                with open(self._column_path(source, metric), 'ab') as f:
+                    _write_blank(f, (days - self.days) * self.capacity)
+            self.days = days
+
+    def _relayout(self, start: Optional['np.datetime64'], days: int, capacity: int) -> None:
+        """Rewrite every column for a new start date, day count or capacity."""
+        offset = int((self.start - start).astype(int)) if self.start is not None and start is not None else 0
+        # Readers that map a column while it is rewritten see an odd generation
+        self.generation += 1
+        self._save_index()
+        rows = max(1, COPY_BLOCK // (capacity * DTYPE.itemsize))
+        for source, metric in self.columns():
+            path = self._column_path(source, metric)
+            tmp = path + '.tmp'
+            if not days:
+                open(tmp, 'wb').close()
+            else:
+                new = np.memmap(tmp, dtype=DTYPE, mode='w+', shape=(days, capacity))
+                old = np.memmap(path, dtype=DTYPE, mode='r', shape=(self.days, self.capacity)) if self.days else None
+                for lo in range(0, days, rows):
+                    hi = min(days, lo + rows)
+                    new[lo:hi] = np.nan
+                    first, last = max(lo - offset, 0), min(hi - offset, self.days)
+                    if old is not None and first < last:
+                        new[first + offset:last + offset, :self.capacity] = old[first:last]
+                new.flush()
+                del new, old
+            os.replace(tmp, path)
+        self._maps = {}
+        self.start, self.days, self.capacity = start, days, capacity
+        self.generation += 1
+        self._save_index()
+
+    def _writable(self, source: str, metric: str) -> np.memmap:
+        path = self._column_path(source, metric)
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                _write_blank(f, self.days * self.capacity)
+        return np.memmap(path, dtype=DTYPE, mode='r+', shape=(self.days, self.capacity))
+
+    def _save_index(self) -> None:
+        index = {
+            'version': 1,
+            'generation': self.generation,
+            'start': str(self.start) if self.start is not None else None,
+            'days': self.days,
+            'capacity': self.capacity,
+            'isrcs': self.isrcs,
+        }
+        path = os.path.join(self.path, INDEX_FILE)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+        self._index_stat = self._stat_index()
+
+    def _read_index(self) -> Optional[dict]:
+        path = os.path.join(self.path, INDEX_FILE)
+        if not os.path.exists(path):
+            return None
+        stat = self._stat_index()
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        self._index_stat = stat
+        return index
+
+    def _stat_index(self) -> Tuple[int, int, int]:
+        stat = os.stat(os.path.join(self.path, INDEX_FILE))
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _column_path(self, source: str, metric: str) -> str:
+        return os.path.join(self._columns_dir, f"{source}.{metric}.f8")
+
+
+def _write_blank(f, count: int) -> None:
+    """Write ``count`` NaN values to ``f``, at most COPY_BLOCK bytes at a time."""
+    per_block = max(1, min(count, COPY_BLOCK // DTYPE.itemsize))
+    block = np.full(per_block, np.nan, dtype=DTYPE)
+    while count >= per_block:
+        block.tofile(f)
+        count -= per_block
+    if count > 0:
+        block[:count].tofile(f)
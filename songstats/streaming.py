@@ -0,0 +1,258 @@
+"""
+Incremental parsing of large JSON response bodies.
+
+:func:`iter_items` walks a JSON document as it arrives in chunks and yields
+the elements of one array inside it, decoding a single element at a time.
+Only the element being decoded (plus one read chunk) is held in memory, so
+peak memory stays bounded by the largest element rather than the whole
+payload.
+
+Fields that sit next to the array are only known once they have been read.
+Callers that need some of them (``require``) get the elements held back until
+those keys have been seen, or until the enclosing object ends; this only
+buffers when the document puts them after the array.
+"""
+import codecs
+import json
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+ANY = '*'
+CHUNK_SIZE = 64 * 1024
+# Items are handed up through the walker in small batches to keep the
+# per-item cost of nested generators low.
+BATCH_SIZE = 256
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CONTINUATION = frozenset('.eE+-0123456789')
+_decoder = json.JSONDecoder()
+
+
+def iter_text(response, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield the body of a streamed ``requests`` response as decoded text."""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+class _Reader:
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, at_least: int = 1) -> bool:
+        """Append at least ``at_least`` more characters to the buffer; False at EOF."""
+        if self._eof:
+            return False
+        if self._pos:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        parts = [self._buf]
+        added = 0
+        for chunk in self._chunks:
+            parts.append(chunk)
+            added += len(chunk)
+            if added >= at_least:
+                break
+        else:
+            self._eof = True
+        self._buf = ''.join(parts)
+        return added > 0
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._read():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self._pos}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._read(len(self._buf) - self._pos):
+                    raise
+                continue
+            # A number ending at the buffer edge, or cut short by it (``0.``,
+            # ``1e``), may continue in the next chunk.
+            if not self._eof and (end == len(self._buf) or (
+                    self._buf[end] in _NUMBER_CONTINUATION and type(value) in (int, float))):
+                if self._read():
+                    continue
+            self._pos = end
+            return value
+
+
+class ItemStream(Generic[T]):
+    """
+    Iterable over the items of a streamed response.
+
+    ``meta`` collects the scalar fields that sit next to the streamed array
+    at the top level of the document (e.g. ``next_url``). It is complete once
+    iteration has finished.
+
+    The response is closed when iteration finishes. Call :meth:`close`, or use
+    the stream as a context manager, to release it when stopping early or
+    without iterating at all.
+    """
+
+    def __init__(self, items: Iterator[T], meta: Dict[str, Any],
+                 on_close: Optional[Callable[[], None]] = None):
+        self._items = items
+        self.meta = meta
+        self._on_close = on_close
+
+    def __iter__(self) -> Iterator[T]:
+        return self._items
+
+    def __enter__(self) -> 'ItemStream[T]':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        close = getattr(self._items, 'close', None)
+        if close is not None:
+            close()
+        if self._on_close is not None:
+            self._on_close()
+
+
+def iter_items(
+        chunks: Iterable[str],
+        path: Sequence[str],
+        meta: Optional[Dict[str, Any]] = None,
+        require: Sequence[str] = (),
+) -> Iterator[Tuple[Tuple[Dict[str, Any], ...], Any]]:
+    """
+    Yield the elements of the array at ``path`` in a chunked JSON document.
+
+    ``path`` is a sequence of object keys, with ``ANY`` standing for every
+    element of an array, e.g. ``('stats', ANY, 'data', 'playlists')``. Each
+    element is yielded together with the scalar fields seen so far in each
+    enclosing object, outermost first. Scalars of the top-level object are
+    also stored in ``meta``.
+
+    Elements are held back until every key in ``require`` is among those
+    scalars, or until the object holding them ends.
+    """
+    reader = _Reader(chunks)
+    top = meta if meta is not None else {}
+    for parents, batch in _walk(reader, tuple(path), (), frozenset(require), top):
+        for item in batch:
+            yield parents, item
+
+
+def _has(parents: Tuple[Dict[str, Any], ...], require: frozenset) -> bool:
+    return all(any(key in scalars for scalars in parents) for key in require)
+
+
+def _walk(reader: _Reader, path: Tuple[str, ...], parents: Tuple[Dict[str, Any], ...],
+          require: frozenset, scalars: Optional[Dict[str, Any]] = None) -> Iterator:
+    if not path:
+        if reader.peek() != '[':
+            reader.value()
+            return
+        reader.expect('[')
+        if reader.peek() == ']':
+            reader.expect(']')
+            return
+        batch = []
+        while True:
+            batch.append(reader.value())
+            if reader.expect(',]') == ']':
+                break
+            if len(batch) >= BATCH_SIZE:
+                yield parents, batch
+                batch = []
+        if batch:
+            yield parents, batch
+        return
+
+    step, rest = path[0], path[1:]
+    if step == ANY:
+        if reader.peek() != '[':
+            reader.value()
+            return
+        reader.expect('[')
+        if reader.peek() == ']':
+            reader.expect(']')
+            return
+        while True:
+            yield from _walk(reader, rest, parents, require)
+            if reader.expect(',]') == ']':
+                return
+
+    if reader.peek() != '{':
+        reader.value()
+        return
+    reader.expect('{')
+    scalars = scalars if scalars is not None else {}
+    parents = parents + (scalars,)
+    if reader.peek() == '}':
+        reader.expect('}')
+        return
+    held = []
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == step:
+            for batch in _walk(reader, rest, parents, require):
+                if held or not _has(batch[0], require):
+                    held.append(batch)
+                else:
+                    yield batch
+        else:
+            value = reader.value()
+            if not isinstance(value, (dict, list)):
+                scalars[key] = value
+                if held and _has(parents, require):
+                    yield from held
+                    held = []
+        if reader.expect(',}') == '}':
+            yield from held
+            return
+
+
+def stream_items(
+        response,
+        path: Sequence[str],
+        build: Callable[[Tuple[Dict[str, Any], ...], Any], T],
+        chunk_size: int = CHUNK_SIZE,
+        require: Sequence[str] = (),
+) -> ItemStream[T]:
+    """Stream a response body, mapping each element at ``path`` through ``build``."""
+    meta: Dict[str, Any] = {}
+
+    def items() -> Iterator[T]:
+        try:
+            for parents, item in iter_items(iter_text(response, chunk_size), path, meta, require):
+                yield build(parents, item)
+        finally:
+            response.close()
+
+    return ItemStream(items(), meta, response.close)
@@ -0,0 +1,57 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from songstats.aggregate import HistoryFrame, rolling
+from songstats.models import HistoricStats
+
+
+@pytest.fixture
+def frame():
+    return HistoryFrame.from_histories({
+        "ISRC1": {
+            "spotify": [
+                HistoricStats(date="2023-01-01", streams_total=100),
+                HistoricStats(date="2023-01-03", streams_total=130),
+            ],
+            "deezer": [HistoricStats(date="2023-01-02", streams_total=10)],
+        },
+        "ISRC2": {
+            "spotify": [
+                HistoricStats(date="2023-01-02", streams_total=50),
+                HistoricStats(date="2023-01-03", streams_total=60),
+            ],
+        },
+    })
+
+
+def test_alignment_and_totals(frame):
+    assert list(frame.dates.astype(str)) == ["2023-01-01", "2023-01-02", "2023-01-03"]
+    # ISRC1 is forward-filled on 2023-01-02, ISRC2 has no data on 2023-01-01
+    np.testing.assert_array_equal(frame.total("streams_total", "spotify"), [100, 150, 190])
+    np.testing.assert_array_equal(frame.total("streams_total"), [100, 160, 200])
+
+
+def test_delta_growth_rolling(frame):
+    # ISRC2 starts on 2023-01-02: its first total is not counted as gained
+    np.testing.assert_array_equal(frame.delta("streams_total", "spotify"), [np.nan, 0, 40])
+    np.testing.assert_allclose(frame.growth("streams_total", "spotify"), [np.nan, 0, 40 / 150])
+    np.testing.assert_array_equal(frame.rolling("streams_total", 2, "spotify"), [np.nan, 0, 40])
+    # Same for a source that starts later: deezer adds no gain on 2023-01-02
+    np.testing.assert_array_equal(frame.delta("streams_total"), [np.nan, 0, 40])
+
+
+def test_delta_ignores_tracks_entering_the_catalog():
+    frame = HistoryFrame.from_histories({
+        "A": {"spotify": [HistoricStats(date="2023-01-01", streams_total=1000),
+                          HistoricStats(date="2023-01-02", streams_total=1100)]},
+        "B": {"spotify": [HistoricStats(date="2023-01-02", streams_total=5_000_000)]},
+    })
+    np.testing.assert_array_equal(frame.delta("streams_total"), [np.nan, 100])
+    np.testing.assert_array_equal(frame.total("streams_total"), [1000, 5_001_100])
+
+
+def test_rolling_mean_skips_missing():
+    np.testing.assert_array_equal(
+        rolling(np.array([1.0, np.nan, 3.0, 5.0]), 2, how="mean"), [np.nan, 1, 3, 4]
+    )
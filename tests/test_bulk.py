@@ -0,0 +1,73 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from songstats import SongstatsClient
+from songstats.bulk import BulkFetcher
+from songstats.exceptions import NotFound, ParameterError
+from songstats.models import TrackStats
+from songstats.parsing import pack, unpack
+
+
+def response(status_code, body):
+    res = Mock()
+    res.status_code = status_code
+    res.content = json.dumps(body).encode()
+    res.json.return_value = body
+    return res
+
+
+def test_bulk_current_stats_decodes_in_worker_processes():
+    with patch('requests.Session'):
+        client = SongstatsClient("test_key")
+        session = client.session
+    session.get.side_effect = lambda url, params=None, **kwargs: (
+        response(404, {"message": "Not found"}) if params["isrc"] == "MISSING" else
+        response(200, {"stats": [{"source": "spotify", "data": {
+            "streams_total": len(params["isrc"]),
+            "playlists": [{"name": params["isrc"], "external_url": "", "artwork": "", "owner_name": "",
+                           "top_position": 1, "top_position_date": "2023-01-01", "added_at": "2023-01-01"}],
+        }}]})
+    )
+
+    with BulkFetcher(client, processes=2) as bulk:
+        results = bulk.current_stats(["A", "BB", "MISSING"], return_exceptions=True)
+        assert results["A"][0].streams_total == 1
+        assert results["BB"][0].playlists[0].name == "BB"
+        assert isinstance(results["MISSING"], NotFound)
+
+        with pytest.raises(NotFound):
+            bulk.current_stats(["MISSING"])
+
+        rows = bulk.current_stats(["A"], packed=True)["A"]
+        assert isinstance(rows[0], tuple)
+        assert unpack(TrackStats, rows[0]).streams_total == 1
+
+        calls = session.get.call_count
+        with pytest.raises(ParameterError):
+            bulk.current_stats(["A"], fields=["streams"])
+        assert session.get.call_count == calls
+
+
+def test_bulk_packed_rows_match_models_across_processes():
+    with patch('requests.Session'):
+        client = SongstatsClient("test_key")
+        session = client.session
+    session.get.side_effect = lambda url, params=None, **kwargs: response(200, {"stats": [
+        {"source": "spotify", "data": {
+            "streams_total": int(params["isrc"]),
+            "charts": [{"name": params["isrc"], "top_position": 1, "top_position_date": "d", "added_at": "d"}],
+        }},
+        {"source": "youtube", "data": {"video_views_total": 1}},
+    ]})
+    isrcs = [str(i) for i in range(50)]
+
+    with BulkFetcher(client, processes=2) as bulk:
+        rows = bulk.current_stats(isrcs, packed=True)
+        stats = bulk.current_stats(isrcs)
+
+    assert len(rows) == len(stats) == 50
+    for isrc in isrcs:
+        assert rows[isrc] == [pack(s) for s in stats[isrc]]
+        assert rows[isrc][0][1] == int(isrc)
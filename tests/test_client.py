@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch
 from songstats import SongstatsClient
-from songstats.exceptions import APIError
+from songstats.exceptions import APIError, ParameterError
 
 
 @pytest.fixture
@@ -37,4 +37,34 @@ def test_error_handling(mock_client):
     mock_client._session.get.return_value = mock_response
 
     with pytest.raises(APIError):
-        mock_client.track.info("invalid_isrc")
\ No newline at end of file
+        mock_client.track.info("invalid_isrc")
+
+def test_current_stats_sources_and_fields(mock_client):
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "stats": [{"source": "spotify", "data": {"streams_total": 10, "playlists": [{"name": "A"}]}}]
+    }
+    mock_client.session.get.return_value = mock_response
+
+    stats = mock_client.track.current_stats("TEST123", sources=["spotify", "tiktok"], fields=["streams_total"])
+    assert stats[0].streams_total == 10
+    assert stats[0].playlists == []
+    assert mock_client.session.get.call_args.kwargs["params"]["source"] == "spotify,tiktok"
+
+    with pytest.raises(ParameterError):
+        mock_client.track.current_stats("TEST123", fields=["not_a_field"])
+
+
+def test_assigned_session_is_used():
+    client = SongstatsClient("test_key")
+    session = Mock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.json.return_value = {
+        "track_info": {"songstats_track_id": "t1", "title": "Assigned", "release_date": "2023-01-01"},
+    }
+    client.session = session
+
+    assert client.session is session
+    assert client.track.info("TEST123").title == "Assigned"
+    session.get.assert_called_once()
@@ -0,0 +1,30 @@
+from unittest.mock import Mock
+
+from songstats.feed import ActivityFeed
+from songstats.models import Activity
+
+
+def activity(date, text):
+    return Activity(source="spotify", activity_text=text, activity_type="playlist",
+                    activity_date=date, activity_tier=1)
+
+
+def test_feed_returns_only_new_activities(tmp_path):
+    track = Mock()
+    track.latest_activities.return_value = [activity("2023-01-02", "b"), activity("2023-01-01", "a")]
+    feed = ActivityFeed(track, str(tmp_path / "cursors.db"))
+
+    assert [a.activity_text for a in feed.poll("ISRC1")] == ["a", "b"]
+    assert feed.poll("ISRC1") == []
+
+    track.latest_activities.return_value = [
+        activity("2023-01-02", "c"), activity("2023-01-02", "b"), activity("2023-01-01", "a")
+    ]
+    assert [a.activity_text for a in feed.poll("ISRC1")] == ["c"]
+    feed.close()
+
+    # Cursors persist across instances
+    reopened = ActivityFeed(track, str(tmp_path / "cursors.db"))
+    assert reopened.poll("ISRC1") == []
+    assert reopened.cursor("ISRC1")[0] == "2023-01-02"
+    assert len(reopened.cursor("ISRC1")[1]) == 2
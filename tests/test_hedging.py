@@ -0,0 +1,111 @@
+import threading
+import time
+from unittest.mock import Mock
+
+from songstats.hedging import HedgedSession, HedgePolicy
+
+
+def test_slow_request_is_hedged():
+    calls = []
+    release = threading.Event()
+
+    def get(url, params=None, **kwargs):
+        calls.append(url)
+        res = Mock(status_code=200, name=f"response{len(calls)}")
+        if len(calls) == 3:
+            # The first request after warm-up hangs until the test ends
+            release.wait(5)
+        return res
+
+    session = Mock()
+    session.get.side_effect = get
+    hedged = HedgedSession(session, HedgePolicy(min_samples=2, min_delay=0.01, budget=1.0))
+
+    hedged.get("https://api/tracks/info", params={"isrc": "A"})
+    hedged.get("https://api/tracks/info", params={"isrc": "A"})
+    assert hedged.hedge_delay("/tracks/info") is not None
+
+    start = time.monotonic()
+    res = hedged.get("https://api/tracks/info", params={"isrc": "A"})
+    assert time.monotonic() - start < 1
+    assert res.status_code == 200
+    assert hedged.hedges == 1 and hedged.hedge_wins == 1
+    assert len(calls) == 4
+    release.set()
+    hedged.close()
+
+
+def test_other_endpoints_are_not_hedged():
+    session = Mock()
+    hedged = HedgedSession(session, HedgePolicy(min_samples=0))
+    hedged.get("https://api/tracks/stats", params={"isrc": "A"})
+    session.get.assert_called_once_with("https://api/tracks/stats", params={"isrc": "A"})
+    assert hedged.hedge_delay("/tracks/stats") is None
+    hedged.close()
+
+
+def test_throttled_hedge_does_not_win():
+    calls = []
+
+    def get(url, params=None, **kwargs):
+        calls.append(url)
+        if len(calls) == 3:
+            time.sleep(0.2)
+            return Mock(status_code=200)
+        return Mock(status_code=429 if len(calls) == 4 else 200)
+
+    session = Mock()
+    session.get.side_effect = get
+    hedged = HedgedSession(session, HedgePolicy(min_samples=2, min_delay=0.01, budget=1.0))
+    hedged.get("https://api/tracks/info")
+    hedged.get("https://api/tracks/info")
+
+    res = hedged.get("https://api/tracks/info")
+    assert res.status_code == 200
+    assert hedged.hedges == 1 and hedged.hedge_wins == 0
+    hedged.close()
+
+
+def test_concurrent_load_does_not_trigger_hedges():
+    upstream = []
+
+    def get(url, params=None, **kwargs):
+        upstream.append(url)
+        time.sleep(0.02)
+        return Mock(status_code=200)
+
+    session = Mock()
+    session.get.side_effect = get
+    policy = HedgePolicy(min_samples=10, budget=1.0)
+    hedged = HedgedSession(session, policy)
+
+    def caller():
+        for _ in range(10):
+            hedged.get("https://api/tracks/info")
+
+    threads = [threading.Thread(target=caller) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # A constant-latency backend only sees hedges from scheduling noise.
+    assert hedged.requests == 160
+    assert hedged.hedges <= 3 * (1 - policy.percentile) * hedged.requests
+    assert len(upstream) == hedged.requests + hedged.hedges
+    hedged.close()
+
+
+def test_hedges_stay_within_budget():
+    def get(url, params=None, **kwargs):
+        # Every request after warm-up is slow
+        time.sleep(0.001 if session.get.call_count <= 5 else 0.05)
+        return Mock(status_code=200)
+
+    session = Mock()
+    session.get.side_effect = get
+    hedged = HedgedSession(session, HedgePolicy(min_samples=5, min_delay=0.001, budget=0.2))
+    for _ in range(30):
+        hedged.get("https://api/tracks/info")
+    assert 0 < hedged.hedges <= 0.2 * hedged.requests
+    hedged.close()
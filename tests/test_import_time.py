@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+
+# Generous budget for `import songstats` plus building a client; the eager
+# imports this guards against (requests and the model decoders) alone took
+# several times as long.
+IMPORT_BUDGET = 0.2
+
+
+def run(code):
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def test_import_and_client_construction_stay_lazy():
+    loaded = run(
+        "import json, sys, songstats\n"
+        "client = songstats.SongstatsClient('k', identity_map=True)\n"
+        "print(json.dumps(sorted(sys.modules)))"
+    )
+    assert 'requests' not in loaded
+    assert 'songstats.endpoints' not in loaded
+    assert 'songstats.parsing' not in loaded
+
+
+def test_endpoints_are_built_on_first_use():
+    loaded = run(
+        "import json, sys, songstats\n"
+        "client = songstats.SongstatsClient('k')\n"
+        "client.track\n"
+        "print(json.dumps(sorted(sys.modules)))"
+    )
+    assert 'requests' in loaded
+    assert 'songstats.endpoints' in loaded
+
+
+def test_import_time_budget():
+    elapsed = run(
+        "import json, time\n"
+        "start = time.perf_counter()\n"
+        "import songstats\n"
+        "songstats.SongstatsClient('k')\n"
+        "print(json.dumps(time.perf_counter() - start))"
+    )
+    assert elapsed < IMPORT_BUDGET
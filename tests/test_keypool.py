@@ -0,0 +1,99 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from songstats import SongstatsClient
+from songstats.exceptions import Unauthorized
+from songstats.keypool import KeyPool
+from songstats.ratelimit import RateLimiter, SharedRateLimiter, key_name
+
+
+def response(status_code, headers=None):
+    res = Mock()
+    res.status_code = status_code
+    res.headers = headers or {}
+    return res
+
+
+def test_pool_ejects_rate_limited_key_and_retries():
+    session = Mock()
+    session.get.side_effect = lambda url, params=None, headers=None, **kwargs: (
+        response(429, {"Retry-After": "60"}) if headers["apikey"] == "k1" else response(200)
+    )
+    pool = KeyPool(["k1", "k2"], session=session, requests_per_second=1000)
+
+    assert pool.get("url").status_code == 200
+    assert [s.key for s in pool.healthy()] == ["k2"]
+    assert pool.get("url").status_code == 200
+    assert [call.kwargs["headers"]["apikey"] for call in session.get.call_args_list] == ["k1", "k2", "k2"]
+
+
+def test_pool_spreads_by_usage_and_returns_last_error():
+    session = Mock()
+    session.get.return_value = response(200)
+    pool = KeyPool(["k1", "k2"], session=session, requests_per_second=1000)
+    pool.set_quota("k1", {"current_month_total_requests": 100})
+
+    pool.get("url")
+    assert session.get.call_args.kwargs["headers"]["apikey"] == "k2"
+
+    session.get.return_value = response(401)
+    assert pool.get("url").status_code == 401
+    assert pool.healthy() == []
+
+    # Revoked keys are not waited for
+    start = time.monotonic()
+    with pytest.raises(Unauthorized):
+        pool.get("url")
+    assert time.monotonic() - start < 1
+
+
+def test_rate_limiter_reserves_in_order():
+    limiter = RateLimiter(rate=10, burst=1)
+    assert limiter.reserve() == 0
+    assert 0.09 < limiter.reserve() <= 0.1
+    limiter.penalize(5)
+    assert limiter.delay() > 4.9
+
+
+def test_shared_rate_limiter_shares_budget_and_penalty(tmp_path):
+    path = str(tmp_path / "limits.db")
+    first = SharedRateLimiter(path, rate=1, burst=2)
+    second = SharedRateLimiter(path, rate=1, burst=2)
+
+    assert first.reserve() == 0
+    assert second.reserve() == 0
+    assert 0.9 < first.reserve() <= 1.0
+
+    second.penalize(30)
+    assert first.delay() > 29
+    assert SharedRateLimiter(path, rate=1, burst=2, name="other").delay() == 0
+
+
+def test_rate_limiter_with_key_pool_keeps_other_keys_available():
+    with patch('requests.Session') as session_cls:
+        client = SongstatsClient(api_keys=["k1", "k2"], rate_limiter=RateLimiter(rate=1000))
+        session = client.session
+    session_cls.return_value.get.side_effect = lambda url, params=None, headers=None, **kwargs: (
+        response(429, {"Retry-After": "5"}) if headers["apikey"] == "k1" else response(200)
+    )
+
+    start = time.monotonic()
+    assert session.get("url").status_code == 200
+    assert session.get("url").status_code == 200
+    assert time.monotonic() - start < 1
+    assert client.key_pool.keys[0].limiter.delay() > 4
+
+
+def test_refresh_quota_does_not_expose_keys():
+    with patch('requests.Session'):
+        client = SongstatsClient(api_keys=["secret_1", "secret_2"])
+        session = client.session
+    res = response(200)
+    res.json.return_value = {"result": "success", "status": {"current_month_total_requests": 5}}
+    session.session.get.return_value = res
+
+    quotas = client.refresh_quota()
+    assert set(quotas) == {key_name("secret_1"), key_name("secret_2")}
+    assert client.key_pool.keys[0].used == 5
@@ -0,0 +1,162 @@
+import pytest
+
+from songstats.models import (
+    AudioFeature, Chart, Collaborator, HistoricStats, Label, Playlist, TrackInfo, Video
+)
+from songstats.identity import IdentityMap
+from songstats.parsing import (
+    decode, decode_artist, pack, parse_catalog_item, parse_stats, parse_track_info, row_decoder, unpack
+)
+
+
+def test_parse_stats_merges_chart_lists():
+    stats = parse_stats([{
+        "source": "spotify",
+        "data": {
+            "streams_total": 1000,
+            "playlists": [{
+                "name": "Top Hits", "external_url": "url", "artwork": "art",
+                "owner_name": "owner", "top_position": 3, "top_position_date": "2023-01-02",
+                "added_at": "2023-01-01", "unknown_key": "ignored"
+            }],
+            "charts": [{"name": "A", "top_position": 1, "top_position_date": "d", "added_at": "d"}],
+            "track_charts": [{"name": "B", "top_position": 2, "top_position_date": "d", "added_at": "d"}],
+        }
+    }])
+
+    assert stats[0].source == "spotify"
+    assert stats[0].streams_total == 1000
+    assert stats[0].playlists == [Playlist(
+        name="Top Hits", external_url="url", artwork="art", owner_name="owner",
+        top_position=3, top_position_date="2023-01-02", added_at="2023-01-01"
+    )]
+    assert [c.name for c in stats[0].charts] == ["A", "B"]
+    assert isinstance(stats[0].charts[0], Chart)
+
+
+def test_parse_track_info_audio_features():
+    track = parse_track_info({
+        "track_info": {
+            "songstats_track_id": "t1", "title": "Song", "release_date": "2023-01-01",
+            "artists": [{"name": "Artist", "songstats_artist_id": "a1"}],
+            "labels": [{"name": "Label", "songstats_label_id": "l1"}],
+        },
+        "audio_analysis": [{"key": "danceability", "value": "0.5"}],
+    })
+
+    assert track.labels == [Label(name="Label", songstats_label_id="l1")]
+    assert track.audio_features == [AudioFeature(key="danceability", value=0.5)]
+
+
+def test_parse_catalog_item_builds_models():
+    track = parse_catalog_item({
+        "songstats_track_id": "t1", "title": "Song", "isrcs": ["ISRC1"],
+        "collaborators": [{"name": "C", "roles": ["Producer"], "songstats_collaborator_id": "c1"}],
+    })
+
+    assert track.isrc == "ISRC1"
+    assert track.collaborators == [Collaborator(name="C", roles=["Producer"], songstats_collaborator_id="c1")]
+
+
+def test_historic_stats_ignore_unknown_keys():
+    entry = decode(HistoricStats, {"date": "2023-01-01", "streams_total": 5, "new_metric": 1})
+    assert entry == HistoricStats(date="2023-01-01", streams_total=5)
+
+
+def test_missing_required_field_raises():
+    with pytest.raises(KeyError):
+        decode(Chart, {"name": "Top 50", "top_position_date": "2023-01-01", "added_at": "2023-01-01"})
+    with pytest.raises(KeyError):
+        decode(Collaborator, {"name": "Max Martin", "songstats_collaborator_id": "c1"})
+    # Fields with a FIELD_DEFAULTS entry may be missing
+    video = decode(Video, {"external_id": "v1", "view_count": 1, "like_count": 0, "comment_count": 0,
+                           "upload_date": "2023-01-01", "image_url": ""})
+    assert video.title == ""
+    # Missing artists default to an empty list, as before the generated decoders
+    track = parse_track_info({"track_info": {"songstats_track_id": "t", "title": "x", "release_date": "d"}})
+    assert track.artists == []
+    # Catalog entries stay lenient
+    track = parse_catalog_item({"songstats_track_id": "t1", "title": "Song"})
+    assert track.release_date is None and track.artists == []
+
+
+def test_identity_map_shares_instances():
+    identity_map = IdentityMap()
+    item = {
+        "songstats_track_id": "t1", "title": "Song",
+        "artists": [{"name": "Artist", "songstats_artist_id": "a1"}],
+        "labels": [{"name": "Label", "songstats_label_id": "l1"}],
+    }
+    first = parse_catalog_item(item, identity_map)
+    second = parse_catalog_item(dict(item, songstats_track_id="t2"), identity_map)
+
+    assert first.artists[0] is second.artists[0]
+    assert first.labels[0] is second.labels[0]
+
+    artist = decode_artist({"name": "Artist", "songstats_artist_id": "a1", "country": "DE"}, identity_map)
+    assert artist is first.artists[0]
+    assert artist.country == "DE"
+
+
+def test_identity_map_keeps_latest_values():
+    identity_map = IdentityMap()
+    old = decode_artist({"name": "X", "songstats_artist_id": "1", "bio": "old", "country": "DE"}, identity_map)
+
+    fresh = decode_artist({"name": "Y", "songstats_artist_id": "1", "bio": "new", "country": None}, identity_map)
+    assert fresh is old
+    assert (old.name, old.bio, old.country) == ("Y", "new", "DE")
+
+    # A bare reference in a track listing does not erase the profile
+    track = parse_catalog_item({"songstats_track_id": "t1", "title": "Song",
+                                "artists": [{"name": "Y", "songstats_artist_id": "1"}]}, identity_map)
+    assert track.artists[0] is old and old.bio == "new"
+
+
+def test_parse_stats_projection():
+    stats = parse_stats([
+        {"source": "spotify", "data": {"streams_total": 10, "popularity_current": 50,
+                                       "playlists": [{"name": "A"}]}},
+        {"source": "deezer", "data": {"streams_total": 5}},
+    ], sources=["spotify"], fields=["streams_total"])
+
+    assert len(stats) == 1
+    assert stats[0].source == "spotify"
+    assert stats[0].streams_total == 10
+    assert stats[0].popularity_current is None
+    assert stats[0].playlists == []
+
+
+def test_pack_unpack_roundtrip():
+    track = parse_track_info({
+        "track_info": {
+            "songstats_track_id": "t1", "title": "Song", "release_date": "2023-01-01",
+            "artists": [{"name": "Artist", "songstats_artist_id": "a1",
+                         "related_artists": [{"name": "Other", "songstats_artist_id": "a2"}]}],
+        },
+        "audio_analysis": [{"key": "duration", "value": "3:30"}],
+    })
+    assert unpack(TrackInfo, pack(track)) == track
+
+
+def test_packed_parsing_matches_pack():
+    info = {
+        "track_info": {
+            "songstats_track_id": "t1", "title": "Song", "release_date": "2023-01-01",
+            "artists": [{"name": "Artist", "songstats_artist_id": "a1"}],
+        },
+        "audio_analysis": [{"key": "duration", "value": "3:30"}, {"key": "energy", "value": "0.5"}],
+    }
+    assert parse_track_info(info, packed=True) == pack(parse_track_info(info))
+
+    stats = [{"source": "spotify", "data": {
+        "streams_total": 10,
+        "playlists": [{"name": "P", "external_url": "", "artwork": "", "owner_name": "",
+                       "top_position": 1, "top_position_date": "d", "added_at": "d"}],
+        "track_charts": [{"name": "C", "top_position": 2, "top_position_date": "d", "added_at": "d"}],
+    }}]
+    assert parse_stats(stats, packed=True) == [pack(s) for s in parse_stats(stats)]
+    assert (parse_stats(stats, fields=["streams_total"], packed=True)
+            == [pack(s) for s in parse_stats(stats, fields=["streams_total"])])
+
+    entry = {"date": "2023-01-01", "streams_total": 5}
+    assert row_decoder(HistoricStats)(entry) == pack(decode(HistoricStats, entry))
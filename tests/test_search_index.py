@@ -0,0 +1,57 @@
+from unittest.mock import Mock, patch
+
+from songstats import SongstatsClient
+from songstats import search_index
+from songstats.search_index import ARTIST, COLLABORATOR, NameIndex
+
+
+def test_prefix_and_fuzzy_lookup(tmp_path):
+    index = NameIndex()
+    index.add(ARTIST, "a1", "David Guetta")
+    index.add(COLLABORATOR, "c1", "Beyoncé")
+    index.add(COLLABORATOR, "c2", "Giorgio Tuinfort")
+
+    assert [e.id for e in index.search("dav")] == ["a1"]
+    assert [e.id for e in index.search("guet")] == ["a1"]
+    assert [e.id for e in index.search("beyonce")] == ["c1"]
+    fuzzy = index.search("giorgo tuinfort")
+    assert fuzzy[0].id == "c2" and fuzzy[0].score < 1.0
+
+    path = str(tmp_path / "names.json")
+    index.save(path)
+    assert [e.id for e in NameIndex.load(path).search("giorgio", kinds=[COLLABORATOR])] == ["c2"]
+
+
+def test_names_added_between_searches(monkeypatch):
+    monkeypatch.setattr(search_index, "MERGE_AT", 4)
+    index = NameIndex()
+    for i in range(10):
+        index.add(ARTIST, f"a{i}", f"Artist {i}")
+        assert [e.id for e in index.search(f"artist {i}") if e.score == 1.0] == [f"a{i}"]
+    # Names both in the merged list and the side list
+    assert len([e for e in index.search("art", limit=20) if e.score == 1.0]) == 10
+
+    index.add(ARTIST, "a0", "Renamed")
+    index.add(ARTIST, "a9", "Renamed Too")
+    assert [e.id for e in index.search("renamed") if e.score == 1.0] == ["a0", "a9"]
+    assert len([e for e in index.search("artist", limit=20) if e.score == 1.0]) == 8
+
+
+def test_search_local_first_falls_back_to_api():
+    with patch('requests.Session'):
+        client = SongstatsClient("test_key", name_index=True)
+        session = client.session
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "result": "success",
+        "results": [{"name": "Max Martin", "songstats_collaborator_id": "c1"}],
+    }
+    session.get.return_value = response
+
+    assert client.collaborator.search("max", local_first=True)["message"] is None
+    assert client.session.get.call_count == 1
+
+    local = client.collaborator.search("max m", local_first=True)
+    assert local["results"] == [{"name": "Max Martin", "songstats_collaborator_id": "c1"}]
+    assert client.session.get.call_count == 1
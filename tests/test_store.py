@@ -0,0 +1,96 @@
+import tracemalloc
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from songstats.aggregate import HistoryFrame
+from songstats.models import HistoricStats
+from songstats import store as store_module
+from songstats.store import HistoricStore, StaleStoreError
+
+
+def test_write_append_and_reopen(tmp_path, monkeypatch):
+    # Copy one day at a time when columns are relaid out
+    monkeypatch.setattr(store_module, "COPY_BLOCK", 1)
+    path = str(tmp_path / "store")
+    store = HistoricStore(path, capacity=1)
+    store.write("ISRC1", {"spotify": [
+        HistoricStats(date="2023-01-01", streams_total=100),
+        HistoricStats(date="2023-01-02", streams_total=110),
+    ]})
+    # Grows capacity and appends a day
+    store.write("ISRC2", {"spotify": [HistoricStats(date="2023-01-03", streams_total=5, playlists_current=2)]})
+
+    reader = HistoricStore(path)
+    assert reader.capacity == 2
+    assert list(reader.dates.astype(str)) == ["2023-01-01", "2023-01-02", "2023-01-03"]
+    np.testing.assert_array_equal(reader.series("ISRC1", "spotify", "streams_total"), [100, 110, np.nan])
+    np.testing.assert_array_equal(reader.series("ISRC2", "spotify", "playlists_current"), [np.nan, np.nan, 2])
+    assert isinstance(reader.column("spotify", "streams_total").base, np.memmap)
+
+    # Older history shifts the date axis
+    store.write("ISRC1", {"spotify": [HistoricStats(date="2022-12-31", streams_total=90)]})
+    reader.refresh()
+    np.testing.assert_array_equal(reader.series("ISRC1", "spotify", "streams_total"), [90, 100, 110, np.nan])
+
+
+def test_frame_from_store(tmp_path):
+    store = HistoricStore(str(tmp_path / "store"))
+    store.write_many({
+        "ISRC1": {"spotify": [HistoricStats(date="2023-01-01", streams_total=100),
+                              HistoricStats(date="2023-01-02", streams_total=120)]},
+        "ISRC2": {"spotify": [HistoricStats(date="2023-01-02", streams_total=50)]},
+    })
+
+    frame = HistoryFrame.from_store(store, metrics=["streams_total"])
+    np.testing.assert_array_equal(frame.total("streams_total", "spotify"), [100, 170])
+    frame = HistoryFrame.from_store(store, isrcs=["ISRC2"], fill=False)
+    np.testing.assert_array_equal(frame.total("streams_total", "spotify"), [np.nan, 50])
+
+
+def test_stale_reader_fails_after_relayout(tmp_path):
+    path = str(tmp_path / "store")
+    writer = HistoricStore(path, capacity=2)
+    writer.write_many({
+        "A": {"spotify": [HistoricStats(date="2023-01-01", streams_total=1),
+                          HistoricStats(date="2023-01-02", streams_total=2)]},
+        "B": {"spotify": [HistoricStats(date="2023-01-01", streams_total=10)]},
+    })
+    reader = HistoricStore(path)
+
+    # A new day keeps the layout: the stale reader still reads correct values
+    writer.write("B", {"spotify": [HistoricStats(date="2023-01-03", streams_total=12)]})
+    np.testing.assert_array_equal(reader.series("A", "spotify", "streams_total"), [1, 2])
+
+    # A third track doubles the capacity
+    writer.write("C", {"spotify": [HistoricStats(date="2023-01-02", streams_total=5)]})
+    reader.refresh()
+    writer.write("D", {"spotify": [HistoricStats(date="2023-01-02", streams_total=7)]})
+    writer.write("E", {"spotify": [HistoricStats(date="2023-01-02", streams_total=9)]})
+    with pytest.raises(StaleStoreError):
+        reader.series("A", "spotify", "streams_total")
+
+    reader.refresh()
+    np.testing.assert_array_equal(reader.series("A", "spotify", "streams_total"), [1, 2, np.nan])
+    np.testing.assert_array_equal(reader.series("E", "spotify", "streams_total"), [np.nan, 9, np.nan])
+
+
+def test_new_columns_and_days_are_written_in_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(store_module, "COPY_BLOCK", 64 * 1024)
+    store = HistoricStore(str(tmp_path / "store"), capacity=4096)
+    store.write("A", {"spotify": [HistoricStats(date="2023-01-01", streams_total=1)]})
+
+    tracemalloc.start()
+    try:
+        # 100 new days for an existing column, then a new 3.2 MB column
+        store.write("A", {"spotify": [HistoricStats(date="2023-04-10", streams_total=2)]})
+        store.write("A", {"deezer": [HistoricStats(date="2023-04-10", streams_total=3)]})
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 1024 * 1024
+    assert store.days == 100
+    np.testing.assert_array_equal(store.series("A", "deezer", "streams_total")[-2:], [np.nan, 3])
+    assert np.isnan(store.column("spotify", "streams_total")[1:-1]).all()
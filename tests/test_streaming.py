@@ -0,0 +1,130 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from songstats import SongstatsClient
+from songstats.streaming import ANY, iter_items
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+STATS = {
+    "result": "success",
+    "stats": [
+        {"source": "spotify", "data": {"streams_total": 12345, "playlists": [
+            {"name": "A", "followers_count": 1000}, {"name": "B", "followers_count": 2000},
+        ]}},
+        {"source": "deezer", "data": {"charts": [{"name": "C"}], "playlists": []}},
+        {"source": "apple_music", "data": {"playlists": [{"name": "D"}]}},
+    ],
+    "message": "done",
+}
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 1000])
+def test_iter_items_across_chunk_boundaries(size):
+    meta = {}
+    items = [
+        (parents[1]["source"], item)
+        for parents, item in iter_items(chunked(json.dumps(STATS, indent=1), size),
+                                        ("stats", ANY, "data", "playlists"), meta)
+    ]
+
+    assert items == [
+        ("spotify", {"name": "A", "followers_count": 1000}),
+        ("spotify", {"name": "B", "followers_count": 2000}),
+        ("apple_music", {"name": "D"}),
+    ]
+    assert meta == {"result": "success", "message": "done"}
+
+
+def test_numbers_split_across_chunks():
+    text = ('{"total": 1e3, "stats": [{"source": "spotify", "data": {"engagement_rate_total": 0.05, '
+            '"delta": -12.5E-2, "playlists": [{"rate": 3.25}, 17]}}], "next": 42}')
+    expected = list(iter_items([text], ("stats", ANY, "data", "playlists")))
+    for split in range(1, len(text)):
+        meta = {}
+        items = list(iter_items([text[:split], text[split:]], ("stats", ANY, "data", "playlists"), meta))
+        assert items == expected, split
+        assert meta == {"total": 1000.0, "next": 42}
+    parents = expected[0][0]
+    assert parents[2] == {"engagement_rate_total": 0.05, "delta": -0.125}
+
+
+def test_stream_catalog():
+    body = json.dumps({
+        "catalog": [{"songstats_track_id": "t1", "title": "Song", "isrcs": ["ISRC1"]}],
+        "tracks_total": 1,
+        "next_url": None,
+    }).encode()
+    response = Mock()
+    response.status_code = 200
+    response.iter_content.return_value = chunked(body, 8)
+
+    with patch('requests.Session'):
+        client = SongstatsClient("test_key")
+        session = client.session
+    session.get.return_value = response
+
+    stream = client.collaborator.stream_catalog(songstats_collaborator_id="c1")
+    tracks = list(stream)
+
+    assert [t.isrc for t in tracks] == ["ISRC1"]
+    assert stream.meta["tracks_total"] == 1
+    assert client.session.get.call_args.kwargs["stream"] is True
+    response.close.assert_called_once()
+
+
+def playlist(name):
+    return {"name": name, "external_url": "", "artwork": "", "owner_name": "",
+            "top_position": 1, "top_position_date": "2023-01-01", "added_at": "2023-01-01"}
+
+
+def streaming_client(*responses):
+    with patch('requests.Session'):
+        client = SongstatsClient("test_key")
+        session = client.session
+    session.get.side_effect = list(responses)
+    return client
+
+
+def body_response(body, status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    response.iter_content.return_value = chunked(json.dumps(body).encode(), 5)
+    return response
+
+
+def test_stream_playlists_with_source_after_data():
+    response = body_response({"stats": [
+        {"data": {"playlists": [playlist("A"), playlist("B")]}, "source": "spotify"},
+        {"source": "deezer", "data": {"playlists": [playlist("C")]}},
+    ]})
+    client = streaming_client(response)
+
+    with client.track.stream_playlists("ISRC1") as stream:
+        items = [(source, playlist.name) for source, playlist in stream]
+
+    assert items == [("spotify", "A"), ("spotify", "B"), ("deezer", "C")]
+    response.close.assert_called()
+
+
+def test_stream_playlists_without_source_fails():
+    client = streaming_client(body_response({"stats": [{"data": {"playlists": [playlist("A")]}}]}))
+    with pytest.raises(ValueError):
+        list(client.track.stream_playlists("ISRC1"))
+
+
+def test_streams_release_responses(monkeypatch):
+    monkeypatch.setattr("songstats.endpoints.time.sleep", lambda seconds: None)
+    throttled = body_response({"message": "slow down"}, status_code=429)
+    response = body_response({"stats": []})
+    client = streaming_client(throttled, response)
+
+    stream = client.track.stream_playlists("ISRC1")
+    throttled.close.assert_called_once()
+    stream.close()  # never iterated
+    response.close.assert_called_once()